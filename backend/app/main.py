@@ -1,15 +1,27 @@
 from datetime import datetime, date, timedelta, timezone
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Iterator
 from pathlib import Path
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+import asyncio
+import hashlib
+import io
+import multiprocessing
 import os
 import re
-import tempfile
+import threading
 import uuid
 
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Query
+import orjson
+
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Query, Header, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_, inspect
+from sqlalchemy import select, insert, and_, func
+from sqlalchemy.exc import IntegrityError
 from dateutil import parser as dtparse
 from dateutil.parser import isoparse as iso_parse
 from zoneinfo import ZoneInfo
@@ -17,16 +29,18 @@ from zoneinfo import ZoneInfo
 import pytesseract
 from PIL import Image
 
-# NEW: light-weight PDF text extraction
-from pypdf import PdfReader
-
 # ── local modules ───────────────────────────────────────────────────
-from .db import Base, engine, get_db
+from .db import engine, get_db
 from .models import Event
-from .schemas import EventIn, EventOut
+from .schemas import EventIn, EventOut, EventOutList
 # ────────────────────────────────────────────────────────────────────
 
-app = FastAPI(title="Cal API")
+class UTCJSONResponse(ORJSONResponse):
+    """orjson, but UTC datetimes end in "Z" like the pydantic output did."""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+app = FastAPI(title="Cal API", default_response_class=UTCJSONResponse)
 
 # ───────────────────────── CORS ─────────────────────────────────────
 from fastapi.middleware.cors import CORSMiddleware
@@ -52,104 +66,266 @@ app.add_middleware(
 # ───────────────────────── Static uploads ───────────────────────────
 UPLOAD_DIR = Path(__file__).resolve().parents[2] / "uploads"  # => /app/uploads
 UPLOAD_DIR.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
 
 # ───────────────────────── OCR / PDF helpers ────────────────────────
-def ocr_to_text(data: bytes) -> str:
-    # Heuristic: tesseract likes PNG; write temp and read
-    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-        tmp.write(data)
-        tmp_path = tmp.name
+# tesserocr keeps the Tesseract engine (and its language model) loaded
+# in-process; pytesseract spawns the CLI per call. Prefer the former when
+# it is installed (requirements-ocr.txt) and can initialise, one API object
+# per worker thread.
+_tess_local = threading.local()
+
+# Parallelism comes from the OCR pool (one page/image per worker), so keep
+# Tesseract's OpenMP to a single thread instead of oversubscribing cores.
+# Set before libtesseract loads; pool workers and the CLI inherit it.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+def _tess_api():
+    api = getattr(_tess_local, "api", None)
+    if api is None and not getattr(_tess_local, "failed", False):
+        try:
+            from tesserocr import PyTessBaseAPI, PSM, OEM
+            api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK, oem=OEM.LSTM_ONLY)
+            api.SetVariable("tessedit_do_invert", "0")
+            _tess_local.api = api
+        except Exception:
+            _tess_local.failed = True  # not installed / no tessdata: use the CLI
+    return api
+
+def _otsu_threshold(hist: list[int]) -> int:
+    """Grey level that maximises between-class variance of a 256-bin histogram."""
+    total = sum(hist)
+    sum_all = sum(i * h for i, h in enumerate(hist))
+    w_b = sum_b = 0
+    best, thr = -1.0, 0
+    for t, h in enumerate(hist):
+        w_b += h
+        w_f = total - w_b
+        if w_b == 0:
+            continue
+        if w_f == 0:
+            break
+        sum_b += t * h
+        m_b = sum_b / w_b
+        m_f = (sum_all - sum_b) / w_f
+        between = w_b * w_f * (m_b - m_f) ** 2
+        if between > best:
+            best, thr = between, t
+    return thr
+
+def binarize(img: Image.Image) -> Image.Image:
+    """
+    Otsu-threshold to pure black/white. Histogram and LUT mapping run in
+    PIL's C code, and a clean bitonal page lets Tesseract skip most of its
+    own thresholding work.
+    """
+    gray = img if img.mode == "L" else img.convert("L")
+    thr = _otsu_threshold(gray.histogram())
+    return gray.point([0] * (thr + 1) + [255] * (255 - thr))
+
+def image_to_text(img: Image.Image) -> str:
+    if os.getenv("OCR_BINARIZE", "1") == "1":
+        img = binarize(img)
+    api = _tess_api()
+    if api is None:
+        # PSM 6: Assume a uniform block of text. OEM default. No inverted-text pass.
+        return pytesseract.image_to_string(img, config="--psm 6 -c tessedit_do_invert=0")
+    api.SetImage(img)
+    return api.GetUTF8Text()
+
+def ocr_to_text(data: bytes | str) -> str:
+    """OCR an image given as raw bytes or a file path."""
+    return image_to_text(Image.open(io.BytesIO(data) if isinstance(data, bytes) else data))
+
+def _ocr_page(page, mat) -> str:
+    import fitz  # PyMuPDF
+
+    # Render straight to 8-bit grey: a third of the RGB buffer, and Tesseract
+    # would have converted it to grey anyway.
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+    img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    return image_to_text(img) or ""
+
+def _ocr_doc_pages(doc, pages: list[int], zoom: float) -> list[str]:
+    """OCR the given page indices of an open fitz document (best effort per page)."""
+    import fitz  # PyMuPDF
+
+    mat = fitz.Matrix(zoom, zoom)
+    texts: list[str] = []
+    for i in pages:
+        try:
+            texts.append(_ocr_page(doc.load_page(i), mat))
+        except Exception:
+            texts.append("")
+    return texts
+
+def _open_pdf(data: bytes | str):
+    """fitz document from raw bytes or a file path (which MuPDF reads lazily)."""
+    import fitz  # PyMuPDF
+
+    if isinstance(data, bytes):
+        return fitz.open(stream=data, filetype="pdf")
+    return fitz.open(data, filetype="pdf")
+
+def _ocr_page_range(data: bytes | str, pages: list[int], zoom: float) -> list[str]:
+    """
+    Open the PDF once and OCR the given page indices.
+    Top-level so it can run inside the PDF OCR process pool.
+    """
+    doc = _open_pdf(data)
     try:
-        # PSM 6: Assume a uniform block of text. OEM default.
-        return pytesseract.image_to_string(Image.open(tmp_path), config="--psm 6")
+        return _ocr_doc_pages(doc, pages, zoom)
     finally:
         try:
-            Path(tmp_path).unlink(missing_ok=True)
+            doc.close()
         except Exception:
             pass
 
-def pdf_ocr_to_text(data: bytes) -> str:
+def _ocr_workers() -> int:
+    return max(1, int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1))))
+
+@lru_cache(maxsize=1)
+def _ocr_pool() -> ProcessPoolExecutor:
+    """
+    Shared process pool for CPU-bound OCR (uploaded images and PDF pages).
+
+    Workers are started from a forkserver (spawn where that's missing),
+    never forked from the API process: the pool is often first created
+    from an asyncio.to_thread worker, and a fork taken while other threads
+    hold locks can leave the child deadlocked on them.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=_ocr_workers(), mp_context=multiprocessing.get_context(method)
+    )
+
+_OCR_POOL_LOCK = threading.Lock()
+
+def _drop_ocr_pool(
+    pool: ProcessPoolExecutor | None = None, wait: bool = False, cancel: bool = False
+) -> None:
+    """
+    Forget the cached OCR pool and shut its workers down, so a fallback or
+    restart never leaves live worker processes behind. Given `pool`, only
+    drop it if it is still the cached one: requests that all saw the same
+    broken pool drop it once, and never the replacement another request
+    has already started using. `cancel` (app shutdown only) also cancels
+    queued OCR.
+    """
+    with _OCR_POOL_LOCK:
+        if not _ocr_pool.cache_info().currsize:
+            return
+        current = _ocr_pool()
+        if pool is not None and pool is not current:
+            return
+        _ocr_pool.cache_clear()
+    current.shutdown(wait=wait, cancel_futures=cancel)
+
+@app.on_event("shutdown")
+def _shutdown_ocr_pool():
+    # the pool is created on first use; reap its workers (after any queued
+    # OCR is cancelled) so reloads and restarts don't leave them behind
+    _drop_ocr_pool(wait=True, cancel=True)
+
+def pdf_ocr_to_text(data: bytes | str, doc=None) -> str:
     """
     OCR fallback for scanned PDFs:
     - Render PDF pages to images using PyMuPDF (fitz)
-    - Run Tesseract on each page
-    """
-    # Keep this lazy so the API still starts even if PyMuPDF isn't installed.
-    try:
-        import fitz  # PyMuPDF
-    except Exception:
-        return ""
+    - Run Tesseract on each page, spread across a process pool
+      (OCR_WORKERS, default cpu_count) since pages are independent
 
+    `doc` is an already-open fitz document for `data`; when given, the
+    in-process path OCRs it directly instead of parsing the bytes again.
+    """
     max_pages = int(os.getenv("PDF_OCR_MAX_PAGES", "10"))
     zoom = float(os.getenv("PDF_OCR_ZOOM", "2.0"))  # ~144 DPI at 2.0
 
-    try:
-        doc = fitz.open(stream=data, filetype="pdf")
-    except Exception:
-        return ""
-
-    texts: list[str] = []
-    try:
-        page_count = min(len(doc), max_pages) if max_pages > 0 else len(doc)
-        mat = fitz.Matrix(zoom, zoom)
-        for i in range(page_count):
-            try:
-                page = doc.load_page(i)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                if pix.n == 1:
-                    mode = "L"
-                else:
-                    mode = "RGB"
-                img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
-                texts.append(pytesseract.image_to_string(img, config="--psm 6") or "")
-            except Exception:
-                # best-effort per page
-                continue
-    finally:
+    if doc is not None:
+        total = len(doc)
+    else:
+        # _open_pdf imports PyMuPDF lazily; without it this is "" too
         try:
-            doc.close()
+            with _open_pdf(data) as tmp:
+                total = len(tmp)
         except Exception:
-            pass
+            return ""
+    page_count = min(total, max_pages) if max_pages > 0 else total
+
+    def ocr_in_process() -> list[str]:
+        pages = list(range(page_count))
+        if doc is not None:
+            return _ocr_doc_pages(doc, pages, zoom)
+        return _ocr_page_range(data, pages, zoom)
+
+    workers = min(page_count, _ocr_workers())
+    if workers <= 1:
+        texts = ocr_in_process()
+    else:
+        # one task per worker (not per page) so each worker opens the PDF once
+        chunks = [list(range(w, page_count, workers)) for w in range(workers)]
+        texts = [""] * page_count
+        pool = _ocr_pool()
+        try:
+            results = pool.map(_ocr_page_range, [data] * workers, chunks, [zoom] * workers)
+            for chunk, chunk_texts in zip(chunks, results):
+                for i, t in zip(chunk, chunk_texts):
+                    texts[i] = t
+        except BrokenProcessPool:
+            # a worker died: replace the pool and OCR in-process
+            _drop_ocr_pool(pool)
+            texts = ocr_in_process()
+        except Exception:
+            # this document failed in a worker; the pool is fine, and
+            # other requests may be using it
+            texts = ocr_in_process()
 
     return "\n".join(t for t in texts if t).strip()
 
-def pdf_to_text(data: bytes) -> str:
+def pdf_to_text(data: bytes | str) -> str:
     """
     Extract text from a PDF.
 
     Strategy:
-    1) Try native text extraction via pypdf (fast for "digital" PDFs)
-    2) If that yields too little text, fall back to OCR for scanned PDFs
+    1) Try native text extraction via PyMuPDF (fast for "digital" PDFs)
+    2) If that yields too little text, fall back to OCR for scanned PDFs,
+       reusing the same open document
+
+    `data` is the file's bytes or its path; pool workers get the path
+    as-is, so a saved upload is never copied into them.
     """
     min_chars = int(os.getenv("PDF_TEXT_MIN_CHARS", "60"))
 
-    # pypdf can read from file-like; simplest is temp file
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        tmp.write(data)
-        pdf_path = tmp.name
-    extracted = ""
+    # PyMuPDF is imported lazily inside _open_pdf so the API still starts
+    # without it; a missing module (ImportError) lands here as well
+    try:
+        doc = _open_pdf(data)
+    except Exception:
+        return ""
+
     try:
-        reader = PdfReader(pdf_path)
+        # nothing to read or OCR; don't spin up the OCR path for it
+        if doc.page_count == 0:
+            return ""
+
         texts = []
-        for page in reader.pages:
+        for page in doc:
             try:
-                texts.append(page.extract_text() or "")
+                texts.append(page.get_text("text") or "")
             except Exception:
                 pass
         extracted = "\n".join(texts).strip()
+
+        # If the text layer has enough, we're done.
+        if extracted and len(extracted) >= min_chars:
+            return extracted
+
+        # Otherwise, try OCR fallback (best effort).
+        ocr_text = pdf_ocr_to_text(data, doc)
     finally:
         try:
-            Path(pdf_path).unlink(missing_ok=True)
+            doc.close()
         except Exception:
             pass
 
-    # If pypdf got enough text, we're done.
-    if extracted and len(extracted) >= min_chars:
-        return extracted
-
-    # Otherwise, try OCR fallback (best effort).
-    ocr_text = pdf_ocr_to_text(data)
     if ocr_text:
         return ocr_text
 
@@ -157,7 +333,8 @@ def pdf_to_text(data: bytes) -> str:
     return extracted
 
 # ───────────────────────── Regex & parsing helpers ──────────────────
-DOW_MAP = {
+# every accepted spelling → day index, JS-style (Sun=0 … Sat=6) to match the frontend
+DOW_INDEX = {
     "sunday": 0, "sun": 0,
     "monday": 1, "mon": 1,
     "tuesday": 2, "tue": 2, "tues": 2,
@@ -167,6 +344,20 @@ DOW_MAP = {
     "saturday": 6, "sat": 6,
 }
 
+MONTH_INDEX = {
+    name: i
+    for i, names in enumerate((
+        ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+        ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+        ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"),
+        ("december", "dec"),
+    ), start=1)
+    for name in names
+}
+
+# Python's weekday() numbering (Mon=0) for the same spellings
+PY_WEEKDAY = {name: (i - 1) % 7 for name, i in DOW_INDEX.items()}
+
 TZ_ABBR = {
     # common US zones; default to standard where ambiguous
     "ET": "America/New_York", "EST": "America/New_York", "EDT": "America/New_York",
@@ -175,8 +366,27 @@ TZ_ABBR = {
     "PT": "America/Los_Angeles","PST":"America/Los_Angeles","PDT":"America/Los_Angeles",
 }
 
-TIME_RANGE_RE = re.compile(r"""
-    (?P<s_h>\d{1,2})
+# google-re2 (optional) matches in linear time; on OCR blobs of a few hundred
+# KB it is 10-40x faster than the backtracking `re` engine. RE2 takes flags
+# inline and has no verbose mode, so _rx translates; any pattern RE2 rejects
+# (or a missing install) falls back to `re`.
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+
+def _rx(pattern: str, flags: int = 0):
+    if _re2 is not None:
+        src = re.sub(r"\s+", "", pattern) if flags & re.VERBOSE else pattern
+        inline = ("i" if flags & re.IGNORECASE else "") + ("m" if flags & re.MULTILINE else "")
+        try:
+            return _re2.compile(f"(?{inline}){src}" if inline else src)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
+TIME_RANGE_RE = _rx(r"""
+    \b(?P<s_h>\d{1,2})
     (?::(?P<s_m>\d{2}))?
     \s*(?P<s_ampm>[ap]m)?
     \s*(?:-|–|—|to)\s*
@@ -185,44 +395,66 @@ TIME_RANGE_RE = re.compile(r"""
     \s*(?P<e_ampm>[ap]m)?
 """, re.IGNORECASE | re.VERBOSE)
 
-TIME_SINGLE_RE = re.compile(r"\b(?P<h>\d{1,2})(?::(?P<m>\d{2}))?\s*(?P<ampm>[ap]m)?\b", re.IGNORECASE)
-DURATION_RE = re.compile(r"\bfor\s+(?:(?P<h>\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h))?\s*(?:(?P<m>\d+)\s*(?:minutes?|mins?|m))?\b", re.IGNORECASE)
-UNTIL_RE    = re.compile(r"\b(?:until|through)\s+(?P<date>(?:\d{1,2}/\d{1,2}(?:/\d{2,4})?|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{1,2}(?:,\s*\d{4})?))", re.IGNORECASE)
-DAYS_LIST_RE = re.compile(r"""
+TIME_SINGLE_RE = _rx(r"\b(?P<h>\d{1,2})(?::(?P<m>\d{2}))?\s*(?P<ampm>[ap]m)?\b", re.IGNORECASE)
+DURATION_RE = _rx(r"\bfor\s+(?:(?P<h>\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h))?\s*(?:(?P<m>\d+)\s*(?:minutes?|mins?|m))?\b", re.IGNORECASE)
+UNTIL_RE    = _rx(r"\b(?:until|through)\s+(?P<date>(?:\d{1,2}/\d{1,2}(?:/\d{2,4})?|(?:jan|feb|mar|apr|may|jun|jul|aug|sept|sep|oct|nov|dec)\w{0,6}\s+\d{1,2}(?:,\s*\d{4})?))", re.IGNORECASE)
+# Alternations list longer spellings first so a word is claimed by the
+# branch that fits it instead of failing the trailing \b and backtracking
+# through its prefixes; repetition is bounded by the seven days a list can
+# name, and month suffixes by the longest name ("sep" + "tember").
+DAYS_LIST_RE = _rx(r"""
     \b
-    (?:(?:every|on)\s+)?                                  
+    (?:(?:every|on)\s+)?
     (?P<days>
       (?:
-        mon|monday|tue|tues|tuesday|wed|weds|wednesday|
-        thu|thur|thurs|thursday|fri|friday|sat|saturday|
-        sun|sunday|weekdays|weekday|daily|everyday
+        monday|mon|tuesday|tues|tue|wednesday|weds|wed|
+        thursday|thurs|thur|thu|friday|fri|saturday|sat|
+        sunday|sun|weekdays|weekday|daily|everyday
       )
       (?:\s*[/,]\s*
-        (?:mon|monday|tue|tues|tuesday|wed|weds|wednesday|
-           thu|thur|thurs|thursday|fri|friday|sat|saturday|
-           sun|sunday)
-      )*
+        (?:monday|mon|tuesday|tues|tue|wednesday|weds|wed|
+           thursday|thurs|thur|thu|friday|fri|saturday|sat|
+           sunday|sun)
+      ){0,6}
     )
     \b
 """, re.IGNORECASE | re.VERBOSE)
 
-DATE_TOKEN_RE = re.compile(r"\b(?:\d{1,2}/\d{1,2}(?:/\d{2,4})?|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{1,2}(?:,\s*\d{2,4})?)\b", re.IGNORECASE)
-DATE_RANGE_RE = re.compile(r"""
-    (?P<d1>\d{1,2}/\d{1,2}(?:/\d{2,4})?|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{1,2}(?:,\s*\d{2,4})?)
+DATE_TOKEN_RE = _rx(r"\b(?:\d{1,2}/\d{1,2}(?:/\d{2,4})?|(?:jan|feb|mar|apr|may|jun|jul|aug|sept|sep|oct|nov|dec)\w{0,6}\s+\d{1,2}(?:,\s*\d{2,4})?)\b", re.IGNORECASE)
+DATE_RANGE_RE = _rx(r"""
+    (?P<d1>\d{1,2}/\d{1,2}(?:/\d{2,4})?|(?:jan|feb|mar|apr|may|jun|jul|aug|sept|sep|oct|nov|dec)\w{0,6}\s+\d{1,2}(?:,\s*\d{2,4})?)
     \s*(?:-|–|—|to|through)\s*
-    (?P<d2>\d{1,2}/\d{1,2}(?:/\d{2,4})?|(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\w*\s+\d{1,2}(?:,\s*\d{2,4})?)
+    (?P<d2>\d{1,2}/\d{1,2}(?:/\d{2,4})?|(?:jan|feb|mar|apr|may|jun|jul|aug|sept|sep|oct|nov|dec)\w{0,6}\s+\d{1,2}(?:,\s*\d{2,4})?)
 """, re.IGNORECASE | re.VERBOSE)
 
-LOCATION_RE = re.compile(r"(?:\b@|\bat\b|\bin\b)\s+(?P<loc>[^,.;\n]+)", re.IGNORECASE)
-DESC_RE     = re.compile(r"\b(?:desc|notes?)\s*:\s*(?P<desc>.+)$", re.IGNORECASE | re.MULTILINE)
-TZ_RE       = re.compile(r"\b(ET|EST|EDT|CT|CST|CDT|MT|MST|MDT|PT|PST|PDT)\b", re.IGNORECASE)
+LOCATION_RE = _rx(r"(?:\b@|\bat\b|\bin\b)\s+(?P<loc>[^,.;\n]+)", re.IGNORECASE)
+DESC_RE     = _rx(r"\b(?:desc|notes?)\s*:\s*(?P<desc>.+)$", re.IGNORECASE | re.MULTILINE)
+TZ_RE       = _rx(r"\b(ET|EST|EDT|CT|CST|CDT|MT|MST|MDT|PT|PST|PDT)\b", re.IGNORECASE)
+NOON_RE     = _rx(r"\bnoon\b", re.IGNORECASE)
+MIDNIGHT_RE = _rx(r"\bmidnight\b", re.IGNORECASE)
+RELATIVE_DATE_RE = _rx(
+    r"\b(?:today|tomorrow|(?P<kind>this|next)\s+(?P<wd>monday|mon|tuesday|tues|tue|wednesday|weds|wed|thursday|thurs|thur|thu|friday|fri|saturday|sat|sunday|sun))\b",
+    re.IGNORECASE,
+)
+MONTH_DAY_ONLY_RE = _rx(r"^\d{1,2}/\d{1,2}$")
+MONTH_NAME_DATE_RE = _rx(r"^([a-z]+)\s+(\d{1,2})(?:,\s*(\d{4}))?$", re.IGNORECASE)
+DAILY_KW_RE = _rx(r"\b(daily|every\s+day|everyday|every\s+weekday|weekdays|weekday)\b", re.IGNORECASE)
+WS_RUN_RE   = _rx(r"\s{2,}")
+# Anything a date/time/repeat pattern could start from (deliberately loose:
+# a false hit only costs the full parse)
+CALENDAR_HINT_RE = _rx(
+    r"\d|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|mon|tue|wed|thu|fri|sat|sun"
+    r"|today|tomorrow|daily|everyday|week",
+    re.IGNORECASE,
+)
+
+# hour offset keyed by the first letter of am/pm; 12am → 0, 12pm → 12 via h % 12
+_AMPM_OFFSET = {"a": 0, "A": 0, "p": 12, "P": 12}
 
 def to_24h(h: int, m: int, ampm: Optional[str]) -> tuple[int,int]:
-    if ampm:
-        a = ampm.lower()
-        if a == "pm" and h != 12: h += 12
-        if a == "am" and h == 12: h = 0
-    return h, m
+    if not ampm:
+        return h, m
+    return h % 12 + _AMPM_OFFSET[ampm[0]], m
 
 def infer_missing_ampm(s_ampm: Optional[str], e_ampm: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
     # If one side has am/pm, assume the other is the same
@@ -232,21 +464,49 @@ def infer_missing_ampm(s_ampm: Optional[str], e_ampm: Optional[str]) -> Tuple[Op
         return e_ampm, e_ampm
     return s_ampm, e_ampm
 
-def parse_time_range(text: str):
-    m = TIME_RANGE_RE.search(text)
-    if not m: return None
-    s_h = int(m.group("s_h")); s_m = int(m.group("s_m") or 0)
-    e_h = int(m.group("e_h")); e_m = int(m.group("e_m") or 0)
-    s_ampm, e_ampm = infer_missing_ampm(m.group("s_ampm"), m.group("e_ampm"))
-    s_h, s_m = to_24h(s_h, s_m, s_ampm)
-    e_h, e_m = to_24h(e_h, e_m, e_ampm)
-    return (s_h, s_m, e_h, e_m)
-
-def parse_single_time_and_duration(text: str) -> Optional[tuple[int,int,int]]:
-    tm = TIME_SINGLE_RE.search(text)
+def _glued_to_date(text: str, m: re.Match) -> bool:
+    """
+    True when a time-looking match is really part of a date ("10-16" in
+    "2026-10-16", "01-11" in "11/01-11/03", "03-2pm" in "12/03-2pm"): a
+    bare hour at either end is joined to more digits directly or by "/"
+    or "-". Dates never carry minutes or am/pm, so "Review-2pm-3pm" and
+    "Room 204-2pm-3pm" keep their times.
+    """
+    g = m.groupdict()
+    if "s_h" in g:
+        bare_start = not (g["s_m"] or g["s_ampm"])
+        bare_end = not (g["e_m"] or g["e_ampm"])
+    else:
+        bare_start = bare_end = not (g["m"] or g["ampm"])
+    s, e = m.span()
+    if bare_start and s > 0 and (
+        text[s - 1].isdigit() or (s >= 2 and text[s - 1] in "/-" and text[s - 2].isdigit())
+    ):
+        return True
+    return bare_end and e + 1 < len(text) and text[e] in "/-" and text[e + 1].isdigit()
+
+def _extract_time(text: str) -> Optional[tuple[int, int, int, int]]:
+    """
+    (s_h, s_m, e_h, e_m) in 24h from a range ("9:30am-10am") or, failing
+    that, a start time plus "for <duration>". None when neither is present.
+    """
+    # step one character at a time so a skipped date fragment ("03-2pm"
+    # in "12/03-2pm-3pm") can't hide a range overlapping it
+    pos = 0
+    while (m := TIME_RANGE_RE.search(text, pos)) is not None:
+        pos = m.start() + 1
+        if _glued_to_date(text, m):
+            continue
+        s_ampm, e_ampm = infer_missing_ampm(m.group("s_ampm"), m.group("e_ampm"))
+        s_h, s_m = to_24h(int(m.group("s_h")), int(m.group("s_m") or 0), s_ampm)
+        e_h, e_m = to_24h(int(m.group("e_h")), int(m.group("e_m") or 0), e_ampm)
+        if s_h < 24 and e_h < 24 and s_m < 60 and e_m < 60:
+            return (s_h, s_m, e_h, e_m)
+
+    tm = next((m for m in TIME_SINGLE_RE.finditer(text) if not _glued_to_date(text, m)), None)
     if not tm: return None
-    h = int(tm.group("h")); m = int(tm.group("m") or 0)
-    h, m = to_24h(h, m, tm.group("ampm"))
+    h, m = to_24h(int(tm.group("h")), int(tm.group("m") or 0), tm.group("ampm"))
+    if h > 23 or m > 59: return None
     dm = DURATION_RE.search(text)
     if not dm: return None
     # allow fractional hours eg "1.5h"
@@ -255,46 +515,96 @@ def parse_single_time_and_duration(text: str) -> Optional[tuple[int,int,int]]:
     mm = int(dm.group("m") or 0)
     duration = int(round(dh*60 + mm))
     if duration <= 0: duration = 60
-    return (h, m, duration)
+    e_h, e_m = divmod((h*60 + m + duration) % 1440, 60)
+    return (h, m, e_h, e_m)
 
-def parse_until_date(text: str, tz: ZoneInfo) -> Optional[date]:
+def _fast_date(s: str) -> Optional[date]:
+    """
+    Parse fully numeric YYYY-MM-DD / MM/DD/YYYY / MM/DD/YY without dateutil.
+    Returns None for any other shape (month names, missing year, bad values).
+    """
+    for sep in ("-", "/"):
+        parts = s.strip().split(sep)
+        if len(parts) != 3 or not all(p.isdigit() for p in parts):
+            continue
+        a, b, c = parts
+        try:
+            if len(a) == 4:
+                return date(int(a), int(b), int(c))
+            y = int(c) if len(c) == 4 else 2000 + int(c)
+            return date(y, int(a), int(b))
+        except ValueError:
+            return None
+    return None
+
+def _token_date(tok: str, now: datetime) -> date:
+    """
+    Date for a token a date regex has already isolated. Numeric and
+    "<Month> D[, YYYY]" shapes skip dateutil; anything else (two-digit
+    years, unusual month spellings) is parsed non-fuzzy from the token
+    alone. A missing year takes now's year. Raises ValueError when
+    unparseable.
+    """
+    tok = tok.strip()
+    fast = _fast_date(tok)
+    if fast:
+        return fast
+    if MONTH_DAY_ONLY_RE.match(tok):
+        mo, d = tok.split("/")
+        return date(now.year, int(mo), int(d))
+    mn = MONTH_NAME_DATE_RE.match(tok)
+    if mn and mn.group(1).lower() in MONTH_INDEX:
+        y = mn.group(3)
+        return date(int(y) if y else now.year, MONTH_INDEX[mn.group(1).lower()], int(mn.group(2)))
+    return dtparse.parse(tok, default=now).date()
+
+def parse_until_date(text: str, now: datetime) -> Optional[date]:
     m = UNTIL_RE.search(text)
     if not m: return None
     raw = m.group("date")
     try:
-        dt = dtparse.parse(raw, fuzzy=True, default=datetime.now(tz))
-        today = datetime.now(tz).date()
-        d = dt.date()
-        if d < today and re.match(r"^\d{1,2}/\d{1,2}$", raw.strip()):
+        today = now.date()
+        d = _token_date(raw, now)
+        if d < today and MONTH_DAY_ONLY_RE.match(raw.strip()):
             d = date(today.year + 1, d.month, d.day)
         return d
     except Exception:
         return None
 
+WORD_RE = _rx(r"\w+")
+_DAY_GROUPS = {
+    "weekday": [1,2,3,4,5], "weekdays": [1,2,3,4,5],
+    "daily": [0,1,2,3,4,5,6], "everyday": [0,1,2,3,4,5,6],
+}
+
 def parse_days_list(text: str) -> Optional[list[int]]:
-    m = DAYS_LIST_RE.search(text)
-    if not m: return None
-    raw = m.group("days")
-    t = raw.lower().strip()
-    if any(k in t for k in ["weekday", "weekdays"]):
-        return [1,2,3,4,5]
-    if any(k in t for k in ["daily", "everyday"]):
-        return [0,1,2,3,4,5,6]
-    parts = re.split(r"[/,]\s*", raw)
-    out: list[int] = []
-    for p in parts:
-        p = p.strip().lower()
-        key = {
-            "mon":"monday","tue":"tuesday","tues":"tuesday","wed":"wednesday","weds":"wednesday",
-            "thu":"thursday","thur":"thursday","thurs":"thursday",
-            "fri":"friday","sat":"saturday","sun":"sunday"
-        }.get(p, p)
-        if key in DOW_MAP:
-            out.append(DOW_MAP[key])
-    return sorted(set(out)) or None
-
-EVERY_WEEKS_RE  = re.compile(r"\b(?:biweekly|every\s+other\s+week|every\s+(?P<n>\d+)\s+weeks?)\b", re.IGNORECASE)
-FOR_WEEKS_RE    = re.compile(r"\bfor\s+(?P<n>\d+)\s+weeks?\b", re.IGNORECASE)
+    """
+    First run of day words ("Mon/Wed", "tue, thu", "weekdays", "daily") as
+    sorted Sun=0 indices. Same matches as DAYS_LIST_RE, but scans each word
+    once with a dict lookup instead of trying the whole alternation at
+    every character.
+    """
+    t = text.lower()
+    days: set[int] = set()
+    prev_end = -1
+    for m in WORD_RE.finditer(t):
+        w = m.group()
+        if prev_end < 0:
+            if w in _DAY_GROUPS:
+                return list(_DAY_GROUPS[w])
+            if w in DOW_INDEX:
+                days.add(DOW_INDEX[w])
+                prev_end = m.end()
+            continue
+        # continue the list only across a single "/" or "," separator
+        if w not in DOW_INDEX or t[prev_end:m.start()].strip() not in ("/", ","):
+            break
+        days.add(DOW_INDEX[w])
+        prev_end = m.end()
+    return sorted(days) or None
+
+EVERY_WEEKS_RE  = _rx(r"\b(?:biweekly|every\s+other\s+week|every\s+(?P<n>\d+)\s+weeks?)\b", re.IGNORECASE)
+FOR_WEEKS_RE    = _rx(r"\bfor\s+(?P<n>\d+)\s+weeks?\b", re.IGNORECASE)
 
 def parse_every_weeks(text: str) -> Optional[int]:
     m = EVERY_WEEKS_RE.search(text)
@@ -310,67 +620,105 @@ def parse_for_weeks(text: str) -> Optional[int]:
     try: return max(1, int(m.group("n")))
     except Exception: return None
 
+def _union(*patterns: re.Pattern) -> re.Pattern:
+    """
+    One pattern matching any of `patterns`, tried in the given order at each
+    position. Named groups become plain groups (names collide across
+    patterns) and verbose patterns keep their flag via a scoped (?x:...).
+    """
+    parts = []
+    for p in patterns:
+        # RE2-compiled members carry their flags inline; the union re-applies them
+        src = re.sub(r"^\(\?[im]+\)", "", p.pattern)
+        src = re.sub(r"\(\?P<\w+>", "(", src)
+        parts.append(f"(?x:{src})" if getattr(p, "flags", 0) & re.VERBOSE else f"(?:{src})")
+    return _rx("|".join(parts), re.IGNORECASE | re.MULTILINE)
+
+# Control phrases scrub_title strips. Stages run in order because a later
+# stage must only see what earlier ones left (e.g. the greedy location
+# phrase would otherwise swallow "for 1.5h", and a date token would split
+# "Nov 1-3" before the time range claims "1-3").
+SCRUB_STAGES = (
+    _union(DESC_RE, UNTIL_RE, FOR_WEEKS_RE, EVERY_WEEKS_RE, DURATION_RE,
+           TIME_RANGE_RE, DAILY_KW_RE, DAYS_LIST_RE),
+    _union(DATE_RANGE_RE, DATE_TOKEN_RE),
+    _union(LOCATION_RE, TZ_RE),
+)
+
 def scrub_title(text: str) -> str:
-    # remove trailing control phrases to leave a clean title
-    t = DESC_RE.sub("", text)
-    t = UNTIL_RE.sub("", t)
-    t = FOR_WEEKS_RE.sub("", t)
-    t = EVERY_WEEKS_RE.sub("", t)
-    t = DURATION_RE.sub("", t)
-    t = TIME_RANGE_RE.sub("", t)
-    t = re.sub(r"\b(daily|every\s+day|everyday|every\s+weekday|weekday|weekdays)\b", "", t, flags=re.I)
-    t = DAYS_LIST_RE.sub("", t)
-    t = DATE_RANGE_RE.sub("", t)
-    t = DATE_TOKEN_RE.sub("", t)
-    t = LOCATION_RE.sub("", t)
-    t = TZ_RE.sub("", t)
-    t = re.sub(r"\s{2,}", " ", t).strip(" ,.-\n\t")
+    # remove control phrases to leave a clean title
+    t = text
+    for stage in SCRUB_STAGES:
+        t = stage.sub("", t)
+    t = WS_RUN_RE.sub(" ", t).strip(" ,.-\n\t")
     return (t or "Untitled").strip()
 
+def _iso_z(dt: datetime) -> str:
+    # naive values are taken as UTC; built from the fields, not strftime
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+    )
+
+# Sized above the ~600 IANA names so a busy multi-zone deployment never
+# evicts; only successful lookups are cached, so junk names can't fill it.
+@lru_cache(maxsize=1024)
+def _zi(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+_UTC = _zi("UTC")
+
 def build_iso(dt_local: datetime, tz: ZoneInfo) -> str:
     dt_local = dt_local.replace(tzinfo=tz)
-    return dt_local.astimezone(ZoneInfo("UTC")).isoformat().replace("+00:00", "Z")
+    return _iso_z(dt_local.astimezone(_UTC))
 
 def pick_tz(prompt_tz: Optional[str], fallback: ZoneInfo) -> ZoneInfo:
     if not prompt_tz:
         return fallback
     abbr = prompt_tz.upper()
     if abbr in TZ_ABBR:
-        return ZoneInfo(TZ_ABBR[abbr])
+        return _zi(TZ_ABBR[abbr])
     try:
-        return ZoneInfo(prompt_tz)
+        return _zi(prompt_tz)
     except Exception:
         return fallback
 
 # ───────────────────────── DB migrations (optional) ─────────────────
-from alembic import command
-from alembic.config import Config
+# Alembic is only imported when AUTO_MIGRATE=1 actually needs it.
+@lru_cache(maxsize=1)
+def _get_config():
+    from alembic.config import Config
 
-def run_migrations() -> None:
     app_dir = Path(__file__).resolve().parent
     cfg = Config(str(app_dir / "alembic.ini"))
     cfg.set_main_option("script_location", str(app_dir / "migrations"))
     if "DATABASE_URL" in os.environ:
         cfg.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
-    command.upgrade(cfg, "head")
+    return cfg
 
-def ensure_event_columns(engine) -> None:
-    with engine.begin() as conn:
-        insp = inspect(conn)
+def run_migrations() -> None:
+    from alembic import command
+
+    cfg = _get_config()
+    # borrow a connection from the app's pool instead of having env.py
+    # open its own
+    with engine.connect() as conn:
+        cfg.attributes["connection"] = conn
         try:
-            cols = {c["name"] for c in insp.get_columns("events")}
-        except Exception:
-            return
-        if "description" not in cols:
-            conn.exec_driver_sql("ALTER TABLE events ADD COLUMN IF NOT EXISTS description TEXT")
-        if "location" not in cols:
-            conn.exec_driver_sql("ALTER TABLE events ADD COLUMN IF NOT EXISTS location TEXT")
+            command.upgrade(cfg, "head")
+            conn.commit()
+        finally:
+            cfg.attributes.pop("connection", None)
+            # the upgrade may have just added (or skipped) events_no_overlap
+            _rejects_overlaps.cache_clear()
 
 @app.on_event("startup")
 def on_startup():
-    if os.getenv("AUTO_MIGRATE") == "1":
-        run_migrations()
-        ensure_event_columns(engine)
+    if os.getenv("AUTO_MIGRATE") != "1":
+        return
+    run_migrations()
 
 # ───────────────────────── Lifecycle & health ───────────────────────
 @app.get("/health")
@@ -392,52 +740,71 @@ def parse_text_into_fields(raw_prompt: str, tz_name: str | None) -> Dict[str, An
     """
     Returns: { title?, start?, end?, repeatDays?, repeatUntil?, repeatEveryWeeks?, location?, description? }
     Times are UTC ISO Z. repeatUntil is local YYYY-MM-DD.
-    """
-    base_tz = ZoneInfo(tz_name) if tz_name else ZoneInfo("UTC")
 
+    Results are cached per (prompt, tz, today): the output only depends on
+    the calendar date in the prompt's effective zone, not the time of day.
+    Prompts over PARSE_CACHE_MAX_CHARS (whole OCR dumps, which rarely
+    repeat) are parsed uncached so they can't pin large keys in memory.
+    """
     text = raw_prompt.strip()
     if not text:
         return {}
 
+    base_tz = _zi(tz_name) if tz_name else _UTC
+    mtz = TZ_RE.search(text)
+    tz = pick_tz(mtz.group(1) if mtz else None, base_tz)
+    today = datetime.now(tz).date()
+    parse = _parse_cached if len(text) <= PARSE_CACHE_MAX_CHARS else _parse_cached.__wrapped__
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in parse(text, tz_name, today)}
+
+PARSE_CACHE_MAX_CHARS = 4096
+
+# one pass over the prompt: dash look-alikes → "-", no-break space → " "
+_DASH_TABLE = str.maketrans({
+    "\u2010": "-", "\u2011": "-", "\u2012": "-", "\u2013": "-", "\u2014": "-",
+    "\u2212": "-", "\xa0": " ",
+})
+
+def _next_weekday(base: date, target_idx: int, inclusive: bool = False) -> date:
+    delta = (target_idx - base.weekday()) % 7
+    if delta == 0 and not inclusive:
+        delta = 7
+    return base + timedelta(days=delta)
+
+@lru_cache(maxsize=4096)
+def _parse_cached(text: str, tz_name: str | None, today: date) -> Tuple[Tuple[str, Any], ...]:
+    base_tz = _zi(tz_name) if tz_name else _UTC
+
     # normalize dashes, special words, and extract tz hint (ET/EST/etc.)
-    text = text.replace("—", "-").replace("–", "-")
-    text = re.sub(r"\bnoon\b", "12:00pm", text, flags=re.I)
-    text = re.sub(r"\bmidnight\b", "12:00am", text, flags=re.I)
+    text = text.translate(_DASH_TABLE)
+    text = NOON_RE.sub("12:00pm", text)
+    text = MIDNIGHT_RE.sub("12:00am", text)
     tz_hint = None
     mtz = TZ_RE.search(text)
     if mtz:
         tz_hint = mtz.group(1)
     tz = pick_tz(tz_hint, base_tz)
 
-    today = datetime.now(tz).date()
-    WEEKDAY = {"mon":0,"tue":1,"tues":1,"wed":2,"thu":3,"thur":3,"thurs":3,"fri":4,"sat":5,"sun":6}
-
-    def next_weekday(base: date, target_idx: int, inclusive=False) -> date:
-        cur = base.weekday()
-        delta = (target_idx - cur) % 7
-        if delta == 0 and not inclusive:
-            delta = 7
-        return base + timedelta(days=delta)
+    # everything below is relative to the start of `today` in tz
+    now = datetime(today.year, today.month, today.day, tzinfo=tz)
 
-    # relative dates → concrete yyyy-mm-dd
+    # relative dates → concrete m/d/yyyy: the shape DATE_TOKEN_RE picks up
+    # below, and one the time patterns can't misread the way they did "26-10"
+    # inside an ISO date
     def replace_relative(m: re.Match) -> str:
-        w = m.group(0).lower()
-        if w == "today":
-            return today.isoformat()
-        if w == "tomorrow":
-            return (today + timedelta(days=1)).isoformat()
-        mt = re.match(r"(this|next)\s+(mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)", w)
-        if mt:
-            kind, wd = mt.groups()
-            idx = WEEKDAY[wd]
-            d = next_weekday(today, idx, inclusive=(kind == "this"))
-            return d.isoformat()
-        return w
-
-    text = re.sub(
-        r"\b(today|tomorrow|(?:this|next)\s+(?:mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun))\b",
-        replace_relative, text, flags=re.I
-    )
+        kind = m.group("kind")
+        if kind is None:
+            d = today if m.group(0).lower() == "today" else today + timedelta(days=1)
+        else:
+            d = _next_weekday(today, PY_WEEKDAY[m.group("wd").lower()], inclusive=(kind.lower() == "this"))
+        return f"{d.month}/{d.day}/{d.year}"
+
+    # Every date, time and repeat pattern below needs a digit, a month or
+    # day name, or a repeat keyword; text with none of them (plain titles,
+    # OCR noise) skips those scans and takes the defaults.
+    calendarish = CALENDAR_HINT_RE.search(text) is not None
+    if calendarish:
+        text = RELATIVE_DATE_RE.sub(replace_relative, text)
 
     # Extract optional location/description early so they don’t pollute title
     location = None
@@ -451,12 +818,12 @@ def parse_text_into_fields(raw_prompt: str, tz_name: str | None) -> Dict[str, An
         description = mdesc.group("desc").strip()
 
     # Date range (e.g., "Nov 1-3", "11/01-11/03")
-    range_m = DATE_RANGE_RE.search(text)
+    range_m = DATE_RANGE_RE.search(text) if calendarish else None
     date_range: Tuple[Optional[date], Optional[date]] = (None, None)
     if range_m:
         try:
-            d1 = dtparse.parse(range_m.group("d1"), fuzzy=True, default=datetime.now(tz)).date()
-            d2 = dtparse.parse(range_m.group("d2"), fuzzy=True, default=datetime.now(tz)).date()
+            d1 = _token_date(range_m.group("d1"), now)
+            d2 = _token_date(range_m.group("d2"), now)
             if d2 < d1:
                 d2 = date(d1.year + 1, d2.month, d2.day)  # naive wrap if needed
             date_range = (d1, d2)
@@ -465,32 +832,24 @@ def parse_text_into_fields(raw_prompt: str, tz_name: str | None) -> Dict[str, An
 
     # Find an explicit single date token (fallback)
     explicit_date = None
-    if not date_range[0]:
+    if calendarish and not date_range[0]:
         try:
-            if DATE_TOKEN_RE.search(text):
-                dt = dtparse.parse(text, fuzzy=True, default=datetime.now(tz))
-                explicit_date = dt.date()
+            mtok = DATE_TOKEN_RE.search(text)
+            if mtok:
+                explicit_date = _token_date(mtok.group(0), now)
         except Exception:
             explicit_date = None
 
     # Time extraction
-    tr = parse_time_range(text)
-    if tr:
-        s_h, s_m, e_h, e_m = tr
-    else:
-        one = parse_single_time_and_duration(text)
-        if one:
-            s_h, s_m, dur = one
-            end_dt = datetime(2000, 1, 1, s_h, s_m) + timedelta(minutes=dur)
-            e_h, e_m = end_dt.hour, end_dt.minute
-        else:
-            s_h, s_m, e_h, e_m = (9, 0, 10, 0)
+    s_h, s_m, e_h, e_m = (calendarish and _extract_time(text)) or (9, 0, 10, 0)
 
     # Repeat detection
-    repeat_days = parse_days_list(text) or None
-    every_weeks = parse_every_weeks(text)
-    for_weeks   = parse_for_weeks(text)
-    until_d     = parse_until_date(text, tz)
+    repeat_days = every_weeks = for_weeks = until_d = None
+    if calendarish:
+        repeat_days = parse_days_list(text) or None
+        every_weeks = parse_every_weeks(text)
+        for_weeks   = parse_for_weeks(text)
+        until_d     = parse_until_date(text, now)
 
     # Range drives repeatUntil if present
     if date_range[0] and date_range[1]:
@@ -535,7 +894,8 @@ def parse_text_into_fields(raw_prompt: str, tz_name: str | None) -> Dict[str, An
         out["location"] = location
     if description:
         out["description"] = description
-    return out
+    # cached value is shared between callers: keep it immutable
+    return tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in out.items())
 
 # ───────────────────────── API Schemas ──────────────────────────────
 from pydantic import BaseModel
@@ -555,56 +915,228 @@ class ParseOut(BaseModel):
     description: str | None = None
 
 # ───────────────────────── /parse endpoint ──────────────────────────
-@app.post("/parse", response_model=ParseOut)
-def parse_endpoint(payload: ParseIn):
-    return parse_text_into_fields(payload.prompt, payload.tz)
+# ParseOut documents the shape; parse_text_into_fields already builds exactly
+# those keys (all plain str/int/list), so hand the dict straight to orjson.
+@app.post("/parse", response_model=None, responses={200: {"model": ParseOut}})
+def parse_endpoint(payload: ParseIn) -> UTCJSONResponse:
+    return UTCJSONResponse(parse_text_into_fields(payload.prompt, payload.tz))
+
+# Cache hit rate for sizing _parse_cached; only exposed when asked for.
+if os.getenv("PARSE_CACHE_STATS") == "1":
+    @app.get("/parse/cache-stats")
+    def parse_cache_stats() -> Dict[str, Any]:
+        info = _parse_cached.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            **info._asdict(),
+            "hitRate": round(info.hits / lookups, 4) if lookups else None,
+        }
 
 # ───────────────────────── Upload ingestion ─────────────────────────
-@app.post("/uploads")
-async def upload_file(
-    file: UploadFile = File(...),
-    tz: str | None = Query(default=None),
-):
-    content = await file.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="Empty file")
+# Tesseract is CPU-bound; leave one core for the event loop / other requests.
+_OCR_SEM = asyncio.Semaphore(max(1, (os.cpu_count() or 2) - 1))
 
+UPLOAD_CHUNK = 1 << 20
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(25 << 20)))
+UPLOAD_BATCH_MAX = int(os.getenv("UPLOAD_BATCH_MAX", "20"))
+
+def _upload_partial_dir() -> Path:
+    # next to UPLOAD_DIR (same filesystem, so the final rename is atomic)
+    return UPLOAD_DIR.with_name(f".{UPLOAD_DIR.name}-partial")
+
+async def _save_upload(file: UploadFile) -> tuple[str, bool]:
+    """
+    Stream an upload into UPLOAD_DIR in chunks; returns (stored name, is_pdf).
+    The original is kept so the frontend can show it, and the extractors
+    read it back from disk. Bytes land in a sibling directory that the
+    /uploads mount doesn't serve and are renamed in once complete, so a
+    half-written file is never downloadable.
+    """
     filename = file.filename or "upload"
     ext = (Path(filename).suffix or "").lower()
     is_pdf = ext == ".pdf" or (file.content_type or "").lower() == "application/pdf"
 
-    if is_pdf:
-        extracted = pdf_to_text(content)
-    else:
-        extracted = ocr_to_text(content)
-
-    fields = parse_text_into_fields(extracted, tz)
-
-    # store original file in uploads so frontend can show it if needed
     safe_name = f"{uuid.uuid4().hex}{ext if ext else ''}"
     out_path = UPLOAD_DIR / safe_name
+    partial_dir = _upload_partial_dir()
+    partial_dir.mkdir(exist_ok=True)
+    part_path = partial_dir / (safe_name + ".part")
+    size = 0
     try:
-        out_path.write_bytes(content)
-    except Exception:
-        pass
+        with part_path.open("wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK):
+                size += len(chunk)
+                if size > UPLOAD_MAX_BYTES:
+                    raise HTTPException(status_code=413, detail="File too large")
+                await asyncio.to_thread(f.write, chunk)
+        if not size:
+            raise HTTPException(status_code=400, detail="Empty file")
+        part_path.replace(out_path)
+    finally:
+        part_path.unlink(missing_ok=True)
+    return safe_name, is_pdf
+
+async def _extract_upload(safe_name: str, is_pdf: bool) -> str:
+    src = str(UPLOAD_DIR / safe_name)
+    # OCR/PDF extraction is blocking; keep it off the event loop, with at most
+    # _OCR_SEM extractions in flight. Image OCR is CPU-bound and goes to the
+    # OCR process pool; PDFs run in a thread because pdf_to_text reads the
+    # text layer cheaply and fans any page OCR out to that same pool itself.
+    async with _OCR_SEM:
+        if is_pdf:
+            return await asyncio.to_thread(pdf_to_text, src)
+        pool = _ocr_pool()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(pool, ocr_to_text, src)
+        except BrokenProcessPool:
+            _drop_ocr_pool(pool)
+            return await asyncio.to_thread(ocr_to_text, src)
 
+def _upload_result(safe_name: str, extracted: str, tz: str | None) -> Dict[str, Any]:
     return {
         "sourceText": extracted,
-        "fields": fields,
+        "fields": parse_text_into_fields(extracted, tz),
         "fileUrl": f"/uploads/{safe_name}",
     }
 
-# ───────────────────────── Event CRUD ───────────────────────────────
-def _overlaps(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
-    return a_start < b_end and b_start < a_end
+@app.post("/uploads")
+async def upload_file(
+    file: UploadFile = File(...),
+    tz: str | None = Query(default=None),
+):
+    safe_name, is_pdf = await _save_upload(file)
+    try:
+        extracted = await _extract_upload(safe_name, is_pdf)
+    except BaseException:
+        (UPLOAD_DIR / safe_name).unlink(missing_ok=True)
+        raise
+    return _upload_result(safe_name, extracted, tz)
+
+@app.post("/uploads/batch")
+async def upload_files_batch(
+    files: list[UploadFile] = File(...),
+    tz: str | None = Query(default=None),
+):
+    """
+    Several screenshots/PDFs in one request; results come back in upload
+    order. Files are stored concurrently, then extracted concurrently
+    through the same warm OCR pool (each worker keeps its Tesseract engine
+    loaded), bounded by _OCR_SEM. Any bad file fails the whole batch.
+    """
+    if len(files) > UPLOAD_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {UPLOAD_BATCH_MAX} files per batch")
+
+    saved = await asyncio.gather(*(_save_upload(f) for f in files), return_exceptions=True)
+    failed = next((r for r in saved if isinstance(r, BaseException)), None)
+    if failed is not None:
+        for r in saved:
+            if not isinstance(r, BaseException):
+                (UPLOAD_DIR / r[0]).unlink(missing_ok=True)
+        raise failed
+
+    # let every extraction finish before unlinking, so no worker is still
+    # reading a file when it goes
+    texts = await asyncio.gather(
+        *(_extract_upload(name, is_pdf) for name, is_pdf in saved), return_exceptions=True
+    )
+    failed = next((t for t in texts if isinstance(t, BaseException)), None)
+    if failed is not None:
+        for name, _ in saved:
+            (UPLOAD_DIR / name).unlink(missing_ok=True)
+        raise failed
+    return [_upload_result(name, text, tz) for (name, _), text in zip(saved, texts)]
 
+# ───────────────────────── Event CRUD ───────────────────────────────
 def _parse_iso_z(s: str) -> datetime:
     dt = iso_parse(s)
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
-@app.get("/events", response_model=list[EventOut])
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+def _overlapping(db: Session, start_dt: datetime, end_dt: datetime):
+    """
+    WHERE clause for events overlapping [start_dt, end_dt). Postgres gets it
+    as a tstzrange overlap so the ix_events_range GiST index can answer it;
+    other backends compare columns against the (start, end) btree. A
+    zero-length window is an empty tstzrange that overlaps nothing, so it
+    takes the column comparison everywhere and matches events containing
+    that instant.
+    """
+    if end_dt > start_dt and db.get_bind().dialect.name == "postgresql":
+        return func.tstzrange(Event.start, Event.end).op("&&")(func.tstzrange(start_dt, end_dt))
+    return and_(Event.start < end_dt, Event.end > start_dt)
+
+@lru_cache(maxsize=None)
+def _rejects_overlaps(bind) -> bool:
+    """
+    True when the events_no_overlap EXCLUDE constraint is in place, so a
+    write either lands or fails with 23P01 and needs no conflict probe.
+    Looked up once per engine and reset by run_migrations(); the
+    migration may have skipped it.
+    """
+    if bind.dialect.name != "postgresql":
+        return False
+    with bind.connect() as conn:
+        q = text("SELECT 1 FROM pg_constraint WHERE conname = 'events_no_overlap'")
+        return conn.execute(q).first() is not None
+
+def _commit_or_conflict(db: Session, write=None):
+    """
+    Run `write` (if any) and commit, turning an exclusion-constraint
+    violation into a 409. Returns whatever `write` returned.
+    """
+    try:
+        out = write() if write is not None else None
+        db.commit()
+        return out
+    except IntegrityError as e:
+        db.rollback()
+        if getattr(e.orig, "pgcode", None) == "23P01":
+            raise HTTPException(status_code=409, detail="Event conflicts with an existing event")
+        raise
+
+def _first_conflict(
+    items: list[tuple[datetime, datetime]],
+    existing: list[tuple[datetime, datetime]],
+) -> Optional[tuple[int, Optional[int]]]:
+    """
+    (i, j) for the first interval `items[i]` that overlaps either another
+    item `items[j]` or an existing interval (j is None), else None.
+
+    Both lists are swept in start order: `existing` gets a running max of
+    its end times, so each item needs one bisect instead of a DB query.
+    """
+    existing = sorted(existing)
+    ex_starts = [s for s, _ in existing]
+    ex_max_end: list[datetime] = []
+    for _, e in existing:
+        ex_max_end.append(max(ex_max_end[-1], e) if ex_max_end else e)
+
+    prev_end: Optional[datetime] = None
+    prev_idx = -1  # item whose end is prev_end
+    for i in sorted(range(len(items)), key=lambda k: items[k][0]):
+        s, e = items[i]
+        if prev_end is not None and s < prev_end:
+            return i, prev_idx
+        k = bisect_left(ex_starts, e)  # existing rows starting before this item ends
+        if k and ex_max_end[k - 1] > s:
+            return i, None
+        if prev_end is None or e > prev_end:
+            prev_end, prev_idx = e, i
+    return None
+
+# Columns backing EventOut, in field order.
+_EVENT_COLS = (Event.id, Event.title, Event.start, Event.end, Event.description, Event.location)
+
+# Rows come straight from our own table: serialise the column mappings
+# directly with orjson, skipping both EventOut and jsonable_encoder.
+@app.get("/events", response_model=None, responses={200: {"model": list[EventOut]}})
 def list_events(
     start: str = Query(...),
     end: str = Query(...),
@@ -612,59 +1144,108 @@ def list_events(
 ):
     start_dt = _parse_iso_z(start)
     end_dt = _parse_iso_z(end)
-    q = select(Event).where(and_(Event.start < end_dt, Event.end > start_dt)).order_by(Event.start.asc())
-    rows = db.execute(q).scalars().all()
-    return rows
+    q = select(*_EVENT_COLS).where(_overlapping(db, start_dt, end_dt)).order_by(Event.start.asc())
+    rows = db.execute(q).mappings().all()
+    return UTCJSONResponse([dict(r) for r in rows])
 
 @app.post("/events", response_model=EventOut, status_code=status.HTTP_201_CREATED)
 def create_event(payload: EventIn, db: Session = Depends(get_db)):
-    start_dt = _parse_iso_z(payload.start)
-    end_dt = _parse_iso_z(payload.end)
+    start_dt = _as_utc(payload.start)
+    end_dt = _as_utc(payload.end)
 
-    q = select(Event).where(and_(Event.start < end_dt, Event.end > start_dt))
-    existing = db.execute(q).scalars().all()
-    if existing:
-        raise HTTPException(status_code=409, detail="Event conflicts with an existing event")
+    if not _rejects_overlaps(db.get_bind()):
+        # indexed existence probe: at most one id, no ORM rows
+        q = select(Event.id).where(_overlapping(db, start_dt, end_dt)).limit(1)
+        if db.execute(q).first() is not None:
+            raise HTTPException(status_code=409, detail="Event conflicts with an existing event")
 
     ev = Event(
         title=payload.title,
         start=start_dt,
         end=end_dt,
-        repeatDays=payload.repeatDays,
-        repeatUntil=payload.repeatUntil,
-        repeatEveryWeeks=payload.repeatEveryWeeks,
         description=getattr(payload, "description", None),
         location=getattr(payload, "location", None),
     )
     db.add(ev)
-    db.commit()
+    _commit_or_conflict(db)
     db.refresh(ev)
     return ev
 
+@app.post(
+    "/events/bulk",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": list[EventOut]}},
+)
+def create_events_bulk(payload: list[EventIn], db: Session = Depends(get_db)):
+    """
+    Create many events (e.g. the expanded occurrences of a repeat) with one
+    conflict query and one batched INSERT. All-or-nothing: any overlap → 409
+    whose detail gives the offending item's `index`, plus `batchIndex` when
+    it clashes with another item in the payload rather than a stored event.
+    The created rows are validated once, through EventOutList, and sent
+    straight to orjson rather than re-validated as a response_model.
+    """
+    if not payload:
+        return UTCJSONResponse([], status_code=status.HTTP_201_CREATED)
+
+    rows = [
+        {**e.model_dump(), "start": _as_utc(e.start), "end": _as_utc(e.end)}
+        for e in payload
+    ]
+    min_s = min(r["start"] for r in rows)
+    max_e = max(r["end"] for r in rows)
+
+    q = select(Event.start, Event.end).where(_overlapping(db, min_s, max_e))
+    existing = [(_as_utc(s), _as_utc(e)) for s, e in db.execute(q).all()]
+
+    clash = _first_conflict([(r["start"], r["end"]) for r in rows], existing)
+    if clash is not None:
+        bad, other = clash
+        if other is None:
+            detail = {"message": f"Event {bad} conflicts with an existing event", "index": bad}
+        else:
+            detail = {
+                "message": f"Event {bad} overlaps event {other} in the same batch",
+                "index": bad,
+                "batchIndex": other,
+            }
+        raise HTTPException(status_code=409, detail=detail)
+
+    def write():
+        created = db.scalars(insert(Event).returning(Event), rows).all()
+        return EventOutList.validate_python(created, from_attributes=True)
+
+    # the sweep above already rejects overlaps; the constraint (if present)
+    # still catches a concurrent writer landing in between
+    out = _commit_or_conflict(db, write)
+    return UTCJSONResponse(EventOutList.dump_python(out), status_code=status.HTTP_201_CREATED)
+
 @app.put("/events/{event_id}", response_model=EventOut)
 def update_event(event_id: int, payload: EventIn, db: Session = Depends(get_db)):
     ev = db.get(Event, event_id)
     if not ev:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    start_dt = _parse_iso_z(payload.start)
-    end_dt = _parse_iso_z(payload.end)
+    start_dt = _as_utc(payload.start)
+    end_dt = _as_utc(payload.end)
 
-    q = select(Event).where(and_(Event.id != event_id, Event.start < end_dt, Event.end > start_dt))
-    existing = db.execute(q).scalars().all()
-    if existing:
-        raise HTTPException(status_code=409, detail="Event conflicts with an existing event")
+    if not _rejects_overlaps(db.get_bind()):
+        q = (
+            select(Event.id)
+            .where(Event.id != event_id, _overlapping(db, start_dt, end_dt))
+            .limit(1)
+        )
+        if db.execute(q).first() is not None:
+            raise HTTPException(status_code=409, detail="Event conflicts with an existing event")
 
     ev.title = payload.title
     ev.start = start_dt
     ev.end = end_dt
-    ev.repeatDays = payload.repeatDays
-    ev.repeatUntil = payload.repeatUntil
-    ev.repeatEveryWeeks = payload.repeatEveryWeeks
     ev.description = getattr(payload, "description", None)
     ev.location = getattr(payload, "location", None)
 
-    db.commit()
+    _commit_or_conflict(db)
     db.refresh(ev)
     return ev
 
@@ -678,6 +1259,13 @@ def delete_event(event_id: int, db: Session = Depends(get_db)):
     return
 
 # ───────────────────────── Suggest next-free ─────────────────────────
+def _seconds_between(db: Session, a, b):
+    """SQL expression for (b - a) in seconds on the session's backend."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", b - a)
+    # whole seconds: julianday() differences pick up float error at minute edges
+    return func.strftime("%s", b) - func.strftime("%s", a)
+
 @app.get("/suggest")
 def suggest_next_free(
     start: str = Query(...),
@@ -690,66 +1278,113 @@ def suggest_next_free(
     if duration.total_seconds() <= 0:
         raise HTTPException(status_code=400, detail="Invalid duration")
 
-    # find conflicts in proposed window
-    q = select(Event).where(and_(Event.start < end_dt, Event.end > start_dt)).order_by(Event.start.asc())
-    conflicts = db.execute(q).scalars().all()
-
-    if not conflicts:
-        return {"suggestedStart": start_dt.isoformat().replace("+00:00", "Z"), "suggestedEnd": end_dt.isoformat().replace("+00:00", "Z")}
-
-    # push forward to after the last conflict end (simple heuristic)
-    new_start = max(c.end for c in conflicts)
-    new_end = new_start + duration
-
-    # If new slot conflicts too, keep pushing
-    while True:
-        q2 = select(Event).where(and_(Event.start < new_end, Event.end > new_start)).order_by(Event.start.asc())
-        conflicts2 = db.execute(q2).scalars().all()
-        if not conflicts2:
-            break
-        new_start = max(c.end for c in conflicts2)
-        new_end = new_start + duration
-
-    return {"suggestedStart": new_start.isoformat().replace("+00:00", "Z"), "suggestedEnd": new_end.isoformat().replace("+00:00", "Z")}
+    # requested slot already free?
+    taken = select(Event.id).where(_overlapping(db, start_dt, end_dt)).limit(1)
+    if db.execute(taken).first() is None:
+        return {"suggestedStart": _iso_z(start_dt), "suggestedEnd": _iso_z(end_dt)}
+
+    # Otherwise the database finds the gap: walk events ending after the
+    # requested start in start order, tracking how far the busy time reaches
+    # so far (running max of end, so long events covering later ones count)
+    # and the next event's start; the first gap that fits opens at `reach`.
+    ordered = (
+        select(
+            Event.start,
+            func.max(Event.end).over(order_by=Event.start, rows=(None, 0)).label("reach"),
+            func.lead(Event.start).over(order_by=Event.start).label("next_start"),
+        )
+        .where(Event.end > start_dt)
+        .cte("ordered")
+    )
+    gap = (
+        select(ordered.c.reach)
+        .where(
+            (ordered.c.next_start.is_(None))
+            | (_seconds_between(db, ordered.c.reach, ordered.c.next_start) >= duration.total_seconds())
+        )
+        .order_by(ordered.c.start)
+        .limit(1)
+    )
+    new_start = _as_utc(db.execute(gap).scalar_one())
+    return {"suggestedStart": _iso_z(new_start), "suggestedEnd": _iso_z(new_start + duration)}
 
 # ───────────────────────── ICS export ───────────────────────────────
 def _ics_dt(dt: datetime) -> str:
-    # dt is stored UTC
-    dtu = dt.astimezone(timezone.utc)
-    return dtu.strftime("%Y%m%dT%H%M%SZ")
+    # stored UTC; SQLite hands it back naive, so don't let astimezone()
+    # read that as local time
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return (
+        f"{dt.year:04d}{dt.month:02d}{dt.day:02d}"
+        f"T{dt.hour:02d}{dt.minute:02d}{dt.second:02d}Z"
+    )
+
+def _ics_etag(db: Session, start_dt: datetime, end_dt: datetime) -> str:
+    """
+    Weak validator for an export window: any insert, update or delete in
+    the window moves either the row count or the newest updated_at. Weak
+    because DTSTAMP differs between otherwise identical bodies.
+    """
+    n, newest = db.execute(
+        select(func.count(), func.max(Event.updated_at)).where(_overlapping(db, start_dt, end_dt))
+    ).one()
+    key = f"{start_dt.isoformat()}|{end_dt.isoformat()}|{n}|{newest}"
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
 
 @app.get("/export/ics")
 def export_ics(
     start: str = Query(...),
     end: str = Query(...),
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
 ):
     start_dt = _parse_iso_z(start)
     end_dt = _parse_iso_z(end)
-    q = select(Event).where(and_(Event.start < end_dt, Event.end > start_dt)).order_by(Event.start.asc())
-    rows = db.execute(q).scalars().all()
+    # calendar clients poll this URL; answer unchanged windows with a 304
+    etag = _ics_etag(db, start_dt, end_dt)
+    headers = {"ETag": etag, "Cache-Control": "max-age=60"}
+    if if_none_match and etag in {t.strip() for t in if_none_match.split(",")}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    q = (
+        select(Event.id, Event.title, Event.start, Event.end, Event.location, Event.description)
+        .where(_overlapping(db, start_dt, end_dt))
+        .order_by(Event.start.asc())
+    )
+    return StreamingResponse(_ics_chunks(db, q), media_type="text/calendar", headers=headers)
+
+_ICS_HEAD = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Cal//Dasha//EN\r\n"
+_ICS_TAIL = "END:VCALENDAR\r\n"
+
+def _vevent(row, dtstamp: str) -> str:
+    eid, title, es, ee, loc, desc = row
+    summary = (title or "").replace("\n", " ")
+    description = (desc or "").replace("\n", "\n ")
+    location = f"LOCATION:{loc}\r\n" if loc else ""
+    return (
+        f"BEGIN:VEVENT\r\nUID:cal-{eid}@local\r\nDTSTAMP:{dtstamp}\r\n"
+        f"DTSTART:{_ics_dt(es)}\r\nDTEND:{_ics_dt(ee)}\r\n"
+        f"SUMMARY:{summary}\r\n{location}DESCRIPTION:{description}\r\nEND:VEVENT\r\n"
+    )
 
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//Cal//Dasha//EN",
-    ]
-    now_utc = datetime.now(timezone.utc)
-    for e in rows:
-        summary = (e.title or "").replace("\n", " ")
-        description = (getattr(e, "description", "") or "").replace("\n", "\n ")
-        lines += [
-            "BEGIN:VEVENT",
-            f"UID:cal-{e.id}@local",
-            f"DTSTAMP:{_ics_dt(now_utc)}",
-            f"DTSTART:{_ics_dt(e.start)}",
-            f"DTEND:{_ics_dt(e.end)}",
-            f"SUMMARY:{summary}",
-            *( [f"LOCATION:{e.location}"] if getattr(e, "location", None) else [] ),
-            f"DESCRIPTION:{description}",
-            "END:VEVENT",
-        ]
-    lines.append("END:VCALENDAR")
-    ics = "\r\n".join(lines) + "\r\n"
-    from fastapi.responses import Response
-    return Response(content=ics, media_type="text/calendar")
\ No newline at end of file
+def _ics_chunks(db: Session, q) -> Iterator[str]:
+    """
+    Yield the calendar a batch of VEVENTs at a time while rows stream off a
+    server-side cursor. get_db has already closed `db` by the time the body
+    is sent; a closed Session is reusable, so run the query here and close
+    it again when the stream ends.
+    """
+    try:
+        yield _ICS_HEAD
+        # same stamp for every VEVENT in this response
+        dtstamp = _ics_dt(datetime.now(timezone.utc))
+        # one joined chunk per 500-row partition rather than one send per event
+        for rows in db.execute(q.execution_options(yield_per=500)).partitions():
+            yield "".join([_vevent(row, dtstamp) for row in rows])
+        yield _ICS_TAIL
+    finally:
+        db.close()
+
+# ───────────────────────── Static uploads ───────────────────────────
+# Mounted last: the mount claims every /uploads/* path, so routes such as
+# /uploads/batch have to be registered before it.
+app.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
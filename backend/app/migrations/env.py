@@ -48,17 +48,29 @@ def run_migrations_offline() -> None:
     with context.begin_transaction():
         context.run_migrations()
 
+def _run_with(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
 def run_migrations_online() -> None:
-    """Run migrations in 'online' mode."""
+    """
+    Run migrations in 'online' mode. A caller that already holds a pooled
+    connection (the app's AUTO_MIGRATE startup, a multi-tenant runner) can
+    pass it as config.attributes["connection"] and skip the fresh
+    connect/TLS/auth round trip; the CLI opens a one-shot NullPool engine.
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with(connection)
+        return
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-        with context.begin_transaction():
-            context.run_migrations()
+        _run_with(connection)
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,67 @@
+"""EXCLUDE constraint rejecting overlapping events (Postgres)
+
+Revision ID: 20261015_events_no_overlap
+Revises: 20261015_events_range_gist
+Create Date: 2026-10-15
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_events_no_overlap"
+down_revision: Union[str, Sequence[str], None] = "20261015_events_range_gist"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+# Same repair as 20261015_events_range_gist, for databases stamped past it:
+# tstzrange() raises on rows that end before they start.
+SWAP_INVERTED = text('UPDATE events SET start = "end", "end" = start WHERE "end" < start')
+HAS_CONSTRAINT = text("SELECT 1 FROM pg_constraint WHERE conname = 'events_no_overlap'")
+FIRST_CLASH = text(
+    'SELECT a.id, b.id FROM events a JOIN events b ON a.id < b.id '
+    'AND tstzrange(a.start, a."end") && tstzrange(b.start, b."end") LIMIT 1'
+)
+
+
+def upgrade() -> None:
+    """
+    Postgres only. The constraint's own GiST index covers the same
+    expression as ix_events_range, so that index is dropped once the
+    constraint is in place. Rows that already overlap (written before the
+    API checked) would make ADD CONSTRAINT fail; in that case the
+    constraint is skipped and the app keeps checking overlaps itself.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    if bind.execute(HAS_CONSTRAINT).first() is not None:
+        return
+    swapped = bind.execute(SWAP_INVERTED).rowcount
+    if swapped:
+        log.warning("swapped start/end on %d events that ended before they started", swapped)
+    clash = bind.execute(FIRST_CLASH).first()
+    if clash is not None:
+        log.warning(
+            "events %s and %s overlap; not adding events_no_overlap", clash[0], clash[1]
+        )
+        return
+    op.execute(
+        'ALTER TABLE events ADD CONSTRAINT events_no_overlap '
+        'EXCLUDE USING GIST (tstzrange(start, "end") WITH &&)'
+    )
+    op.execute("DROP INDEX IF EXISTS ix_events_range")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_events_range ON events USING GIST (tstzrange(start, "end"))'
+    )
+    op.execute("ALTER TABLE events DROP CONSTRAINT IF EXISTS events_no_overlap")
@@ -0,0 +1,49 @@
+"""GiST index over tstzrange(start, end) for overlap queries (Postgres)
+
+Revision ID: 20261015_events_range_gist
+Revises: 20261015_events_start_end_idx
+Create Date: 2026-10-15
+"""
+
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_events_range_gist"
+down_revision: Union[str, Sequence[str], None] = "20261015_events_start_end_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+# tstzrange() raises on lower > upper. Rows written before the API checked
+# end > start can be inverted; flip them rather than abort the upgrade.
+SWAP_INVERTED = text('UPDATE events SET start = "end", "end" = start WHERE "end" < start')
+
+
+def upgrade() -> None:
+    """
+    Postgres only: the app writes its overlap predicate as
+    tstzrange(start, "end") && tstzrange(:s, :e), which this expression
+    index serves. Other backends keep using ix_events_start_end. Rows
+    whose end precedes their start are swapped first, since building the
+    index would otherwise fail the whole upgrade.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    swapped = bind.execute(SWAP_INVERTED).rowcount
+    if swapped:
+        log.warning("swapped start/end on %d events that ended before they started", swapped)
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_events_range ON events USING GIST (tstzrange(start, "end"))'
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_events_range")
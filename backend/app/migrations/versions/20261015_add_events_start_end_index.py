@@ -0,0 +1,31 @@
+"""composite (start, end) index for overlap checks
+
+Revision ID: 20261015_events_start_end_idx
+Revises: 20251215_add_recurrence
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_events_start_end_idx"
+down_revision: Union[str, Sequence[str], None] = "20251215_add_recurrence"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    insp = inspect(op.get_bind())
+    names = {ix["name"] for ix in insp.get_indexes("events")}
+    if "ix_events_start_end" not in names:
+        op.create_index("ix_events_start_end", "events", ["start", "end"])
+
+
+def downgrade() -> None:
+    insp = inspect(op.get_bind())
+    names = {ix["name"] for ix in insp.get_indexes("events")}
+    if "ix_events_start_end" in names:
+        op.drop_index("ix_events_start_end", table_name="events")
@@ -0,0 +1,43 @@
+"""add events.updated_at for ICS export validators
+
+Revision ID: 20261015_events_updated_at
+Revises: 20261015_events_no_overlap
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_events_updated_at"
+down_revision: Union[str, Sequence[str], None] = "20261015_events_no_overlap"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    The app stamps updated_at on insert and on every ORM update. Existing
+    rows are backfilled with the migration time. SQLite can't ADD COLUMN
+    with a non-constant default, so the NOT NULL + now() default is
+    Postgres only.
+    """
+    bind = op.get_bind()
+    cols = {c["name"] for c in inspect(bind).get_columns("events")}
+    if "updated_at" in cols:
+        return
+    op.add_column("events", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE events SET updated_at = CURRENT_TIMESTAMP")
+    if bind.dialect.name == "postgresql":
+        op.alter_column(
+            "events", "updated_at", nullable=False, server_default=sa.func.now()
+        )
+
+
+def downgrade() -> None:
+    cols = {c["name"] for c in inspect(op.get_bind()).get_columns("events")}
+    if "updated_at" in cols:
+        op.drop_column("events", "updated_at")
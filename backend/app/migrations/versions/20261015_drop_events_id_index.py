@@ -0,0 +1,29 @@
+"""drop redundant ix_events_id (the primary key is already indexed)
+
+Revision ID: 20261015_drop_events_id_idx
+Revises: 20261015_events_updated_at
+Create Date: 2026-10-15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_drop_events_id_idx"
+down_revision: Union[str, Sequence[str], None] = "20261015_events_updated_at"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # only databases built with create_all() have it; migrations never did
+    names = {ix["name"] for ix in inspect(op.get_bind()).get_indexes("events")}
+    if "ix_events_id" in names:
+        op.drop_index("ix_events_id", table_name="events")
+
+
+def downgrade() -> None:
+    # nothing to restore: the pre-upgrade state may not have had it either
+    pass
@@ -1,18 +1,30 @@
 from __future__ import annotations
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import Integer, String, DateTime
+from sqlalchemy import Integer, String, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .db import Base
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # overlap probes filter on start < :end AND end > :start
+        Index("ix_events_start_end", "start", "end"),
+    )
 
-    id:    Mapped[int]       = mapped_column(Integer, primary_key=True, index=True)
+    id:    Mapped[int]       = mapped_column(Integer, primary_key=True)
     title: Mapped[str]       = mapped_column(String(200), nullable=False)
     start: Mapped[datetime]  = mapped_column(DateTime(timezone=True), nullable=False)
     end:   Mapped[datetime]  = mapped_column(DateTime(timezone=True), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(String(2000), nullable=True)
-    location:    Mapped[Optional[str]] = mapped_column(String(255),   nullable=True)
\ No newline at end of file
+    location:    Mapped[Optional[str]] = mapped_column(String(255),   nullable=True)
+    # bumped on every insert/update; the ICS export derives its ETag from it
+    updated_at:  Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False,
+        default=_utcnow, onupdate=_utcnow, server_default=func.now(),
+    )
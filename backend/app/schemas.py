@@ -1,12 +1,12 @@
 # backend/app/schemas.py
 from __future__ import annotations
 from typing import Optional
-from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime, timezone
+from pydantic import BaseModel, ConfigDict, TypeAdapter, model_validator
 
 
-class EventIn(BaseModel):
-    """Request/response schema for event creation/update."""
+class EventBase(BaseModel):
+    """Fields shared by event requests and responses."""
     title: str
     start: datetime  # UTC ISO string in/out
     end:   datetime
@@ -14,7 +14,30 @@ class EventIn(BaseModel):
     location:    Optional[str] = None
 
 
-class EventOut(EventIn):
-    """Response schema for an event row (includes ID)."""
+class EventIn(EventBase):
+    """Request schema for event creation/update."""
+
+    @model_validator(mode="after")
+    def _end_after_start(self) -> "EventIn":
+        # an inverted interval can't be stored as a range (see ix_events_range),
+        # and an empty one never overlaps anything under Postgres' && (nor the
+        # events_no_overlap constraint) while SQLite's comparisons would
+        # still flag it, so both are rejected
+        def utc(dt: datetime) -> datetime:
+            return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+        if utc(self.end) <= utc(self.start):
+            raise ValueError("end must be after start")
+        return self
+
+
+class EventOut(EventBase):
+    """
+    Response schema for an event row (includes ID). Not re-checked against
+    EventIn's rules, so rows stored before they existed still serialise.
+    """
     id: int
-    model_config = ConfigDict(from_attributes=True)  # allow from ORM
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)  # allow from ORM
+
+
+# validates a whole list of rows in one call into the compiled core
+EventOutList = TypeAdapter(list[EventOut])
@@ -0,0 +1,265 @@
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base, engine, get_db
+from app.main import (
+    app, _commit_or_conflict, _first_conflict, _ics_dt, _iso_z, _overlapping, _rejects_overlaps,
+)
+from app.models import Event
+from app.schemas import EventOut
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    TestSession = sessionmaker(bind=engine, autoflush=False, future=True)
+
+    def _get_db():
+        db = TestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+def _utc(h, m=0, day=1):
+    return datetime(2025, 12, day, h, m, tzinfo=timezone.utc)
+
+
+def test_first_conflict_sweep():
+    existing = [(_utc(9), _utc(10)), (_utc(12), _utc(18))]
+    assert _first_conflict([(_utc(10), _utc(11)), (_utc(11), _utc(12))], existing) is None
+    assert _first_conflict([(_utc(10), _utc(11)), (_utc(17), _utc(19))], existing) == (1, None)
+    # long existing event swallowing a later short one
+    assert _first_conflict([(_utc(14), _utc(15))], [(_utc(8), _utc(20)), (_utc(9), _utc(10))]) == (0, None)
+    # items overlapping each other
+    assert _first_conflict([(_utc(20), _utc(22)), (_utc(21), _utc(23))], []) == (1, 0)
+    # the clash is with the long item, not the most recent one
+    items = [(_utc(13), _utc(14)), (_utc(8), _utc(20)), (_utc(9), _utc(10))]
+    assert _first_conflict(items, []) == (2, 1)
+
+
+def test_bulk_create_and_conflict(client):
+    occurrences = [
+        {"title": "Lecture", "start": f"2025-12-0{d}T09:30:00Z", "end": f"2025-12-0{d}T10:20:00Z"}
+        for d in (1, 3, 8)
+    ]
+    r = client.post("/events/bulk", json=occurrences)
+    assert r.status_code == 201
+    body = r.json()
+    assert [e["title"] for e in body] == ["Lecture"] * 3
+    assert len({e["id"] for e in body}) == 3
+
+    r = client.post("/events/bulk", json=[
+        {"title": "Lunch", "start": "2025-12-05T12:00:00Z", "end": "2025-12-05T13:00:00Z"},
+        {"title": "Clash", "start": "2025-12-03T10:00:00Z", "end": "2025-12-03T11:00:00Z"},
+    ])
+    assert r.status_code == 409
+    assert r.json()["detail"] == {"message": "Event 1 conflicts with an existing event", "index": 1}
+
+    r = client.post("/events/bulk", json=[
+        {"title": "A", "start": "2025-12-10T12:00:00Z", "end": "2025-12-10T14:00:00Z"},
+        {"title": "B", "start": "2025-12-10T13:00:00Z", "end": "2025-12-10T15:00:00Z"},
+    ])
+    assert r.status_code == 409
+    assert r.json()["detail"]["index"] == 1 and r.json()["detail"]["batchIndex"] == 0
+    assert "same batch" in r.json()["detail"]["message"]
+
+    r = client.get("/events", params={"start": "2025-12-01T00:00:00Z", "end": "2025-12-31T00:00:00Z"})
+    listed = r.json()
+    assert [e["title"] for e in listed] == ["Lecture"] * 3
+    assert set(listed[0]) == {"id", "title", "start", "end", "description", "location"}
+    assert listed[0]["start"].startswith("2025-12-01T09:30:00")
+
+
+def test_export_ics(client):
+    client.post("/events/bulk", json=[
+        {"title": "Dentist", "start": "2025-12-02T15:00:00Z", "end": "2025-12-02T16:00:00Z", "location": "Main St"},
+        {"title": "Call", "start": "2025-12-04T15:00:00Z", "end": "2025-12-04T15:30:00Z"},
+    ])
+    r = client.get("/export/ics", params={"start": "2025-12-01T00:00:00Z", "end": "2025-12-31T00:00:00Z"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/calendar")
+    body = r.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    assert body.count("BEGIN:VEVENT") == 2
+    assert "DTSTART:20251202T150000Z\r\n" in body
+    assert "LOCATION:Main St\r\n" in body
+    stamps = {l for l in body.split("\r\n") if l.startswith("DTSTAMP:")}
+    assert len(stamps) == 1
+
+
+def test_zero_length_window_matches_containing_event(client):
+    client.post("/events", json={"title": "Standup", "start": "2025-12-01T09:00:00Z", "end": "2025-12-01T10:00:00Z"})
+    at = {"start": "2025-12-01T09:30:00Z", "end": "2025-12-01T09:30:00Z"}
+    assert [e["title"] for e in client.get("/events", params=at).json()] == ["Standup"]
+    assert client.get("/export/ics", params=at).text.count("BEGIN:VEVENT") == 1
+
+    # Postgres must not turn it into an empty tstzrange that matches nothing
+    class PgSession:
+        def get_bind(self):
+            return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    instant = _utc(9, 30)
+    clause = str(_overlapping(PgSession(), instant, instant))
+    assert "tstzrange" not in clause
+    assert "tstzrange" in str(_overlapping(PgSession(), instant, _utc(10)))
+
+
+def test_create_update_conflict_and_suggest(client):
+    r = client.post("/events", json={"title": "Standup", "start": "2025-12-01T09:00:00Z", "end": "2025-12-01T10:00:00Z"})
+    assert r.status_code == 201
+    r = client.post("/events", json={"title": "Review", "start": "2025-12-01T11:00:00Z", "end": "2025-12-01T12:00:00Z"})
+    review_id = r.json()["id"]
+
+    r = client.post("/events", json={"title": "Clash", "start": "2025-12-01T09:30:00Z", "end": "2025-12-01T10:30:00Z"})
+    assert r.status_code == 409
+    r = client.put(f"/events/{review_id}", json={"title": "Review", "start": "2025-12-01T09:45:00Z", "end": "2025-12-01T10:45:00Z"})
+    assert r.status_code == 409
+    # moving an event within its own slot is not a conflict with itself
+    r = client.put(f"/events/{review_id}", json={"title": "Review", "start": "2025-12-01T11:15:00Z", "end": "2025-12-01T12:15:00Z"})
+    assert r.status_code == 200
+
+    r = client.get("/suggest", params={"start": "2025-12-01T09:30:00Z", "end": "2025-12-01T10:30:00Z"})
+    assert r.json() == {"suggestedStart": "2025-12-01T10:00:00Z", "suggestedEnd": "2025-12-01T11:00:00Z"}
+
+
+def test_suggest_sweeps_past_back_to_back_events(client):
+    client.post("/events/bulk", json=[
+        {"title": "A", "start": "2025-12-01T09:00:00Z", "end": "2025-12-01T10:00:00Z"},
+        {"title": "B", "start": "2025-12-01T10:30:00Z", "end": "2025-12-01T11:00:00Z"},
+        {"title": "C", "start": "2025-12-01T12:00:00Z", "end": "2025-12-01T13:00:00Z"},
+    ])
+    # 30-minute gap after A is too short for an hour; 11:00–12:00 fits
+    r = client.get("/suggest", params={"start": "2025-12-01T09:30:00Z", "end": "2025-12-01T10:30:00Z"})
+    assert r.json() == {"suggestedStart": "2025-12-01T11:00:00Z", "suggestedEnd": "2025-12-01T12:00:00Z"}
+    # free slot is returned unchanged
+    r = client.get("/suggest", params={"start": "2025-12-01T14:00:00Z", "end": "2025-12-01T15:00:00Z"})
+    assert r.json() == {"suggestedStart": "2025-12-01T14:00:00Z", "suggestedEnd": "2025-12-01T15:00:00Z"}
+
+
+@pytest.mark.parametrize("end", ["2025-12-01T09:00:00Z", "2025-12-01T10:00:00Z"])
+def test_rejects_end_not_after_start(client, end):
+    # zero-length events would overlap on SQLite but never under Postgres' &&
+    r = client.post("/events", json={"title": "Backwards", "start": "2025-12-01T10:00:00Z", "end": end})
+    assert r.status_code == 422
+    r = client.post("/events/bulk", json=[{"title": "Point", "start": "2025-12-01T10:00:00Z", "end": end}])
+    assert r.status_code == 422
+
+
+def test_event_out_accepts_legacy_inverted_rows(client):
+    row = Event(id=1, title="Old", start=_utc(10), end=_utc(9))
+    assert EventOut.model_validate(row).end == _utc(9)
+
+    assert client.post("/events/bulk", json=[]).status_code == 201
+    schema = client.get("/openapi.json").json()["paths"]["/events/bulk"]["post"]["responses"]["201"]
+    assert schema["content"]["application/json"]["schema"]["items"]["$ref"].endswith("/EventOut")
+
+
+def test_suggest_counts_long_events_covering_later_ones(client):
+    # overlapping rows can't come in through the API any more, but older data has them
+    db = next(app.dependency_overrides[get_db]())
+    db.add_all([
+        Event(title="Workshop", start=_utc(9, day=2), end=_utc(17, day=2)),
+        Event(title="Break", start=_utc(10, day=2), end=_utc(10, 30, day=2)),
+        Event(title="Wrap-up", start=_utc(17, 30, day=2), end=_utc(18, day=2)),
+    ])
+    db.commit()
+    r = client.get("/suggest", params={"start": "2025-12-02T10:00:00Z", "end": "2025-12-02T11:00:00Z"})
+    assert r.json() == {"suggestedStart": "2025-12-02T18:00:00Z", "suggestedEnd": "2025-12-02T19:00:00Z"}
+
+
+def test_exclusion_violation_becomes_409():
+    class Orig(Exception):
+        pgcode = "23P01"
+
+    class FakeSession:
+        rolled_back = False
+
+        def commit(self):
+            raise IntegrityError("INSERT", {}, Orig())
+
+        def rollback(self):
+            self.rolled_back = True
+
+    db = FakeSession()
+    with pytest.raises(HTTPException) as exc:
+        _commit_or_conflict(db)
+    assert exc.value.status_code == 409 and db.rolled_back
+
+    Orig.pgcode = "23505"
+    with pytest.raises(IntegrityError):
+        _commit_or_conflict(FakeSession())
+
+
+# Writes to the configured database, so only against CI's throwaway Postgres
+# (GitHub Actions sets CI=true), never a developer's .env DATABASE_URL.
+@pytest.mark.skipif(
+    not (os.getenv("CI") and engine.dialect.name == "postgresql"),
+    reason="needs CI's migrated Postgres service",
+)
+def test_postgres_exclusion_constraint_returns_409():
+    _rejects_overlaps.cache_clear()
+    assert _rejects_overlaps(engine)
+    c = TestClient(app)
+    ev = {"title": "pg overlap", "start": "2099-01-01T09:00:00Z", "end": "2099-01-01T10:00:00Z"}
+    try:
+        assert c.post("/events", json=ev).status_code == 201
+        clash = dict(ev, start="2099-01-01T09:30:00Z", end="2099-01-01T10:30:00Z")
+        r = c.post("/events", json=clash)
+        assert r.status_code == 409
+        assert r.json()["detail"] == "Event conflicts with an existing event"
+    finally:
+        with engine.begin() as conn:
+            conn.execute(delete(Event).where(Event.title == "pg overlap"))
+
+
+@pytest.mark.parametrize("dt", [
+    datetime(2025, 12, 2, 15, 4, 5),
+    datetime(2025, 12, 2, 15, 4, 5, 999999, tzinfo=timezone.utc),
+    datetime(2025, 12, 2, 10, 4, 5, tzinfo=timezone(timedelta(hours=-5))),
+])
+def test_utc_formatters(dt):
+    assert _ics_dt(dt) == "20251202T150405Z"
+    assert _iso_z(dt) == "2025-12-02T15:04:05Z"
+
+
+def test_export_ics_etag(client):
+    window = {"start": "2025-12-01T00:00:00Z", "end": "2025-12-31T00:00:00Z"}
+    ev = client.post("/events", json={"title": "Call", "start": "2025-12-04T15:00:00Z", "end": "2025-12-04T15:30:00Z"}).json()
+    r = client.get("/export/ics", params=window)
+    etag = r.headers["etag"]
+    assert r.headers["cache-control"] == "max-age=60"
+
+    r = client.get("/export/ics", params=window, headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+
+    client.put(f"/events/{ev['id']}", json={**ev, "title": "Renamed"})
+    r = client.get("/export/ics", params=window, headers={"If-None-Match": etag})
+    assert r.status_code == 200 and "SUMMARY:Renamed" in r.text
+    etag = r.headers["etag"]
+
+    client.delete(f"/events/{ev['id']}")
+    r = client.get("/export/ics", params=window, headers={"If-None-Match": etag})
+    assert r.status_code == 200 and "BEGIN:VEVENT" not in r.text
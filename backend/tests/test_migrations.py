@@ -0,0 +1,23 @@
+import re
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+MIGRATIONS = Path(__file__).resolve().parents[1] / "app" / "migrations"
+REVISION_RE = re.compile(r"^revision: str = [\"'](\w+)[\"']", re.M)
+
+
+def test_revision_ids_are_unique():
+    # Alembic only warns on a duplicate id and keeps one of the files
+    ids = [
+        REVISION_RE.search(p.read_text()).group(1)
+        for p in sorted((MIGRATIONS / "versions").glob("*.py"))
+    ]
+    assert len(ids) == len(set(ids))
+
+
+def test_single_head():
+    cfg = Config()
+    cfg.set_main_option("script_location", str(MIGRATIONS))
+    assert len(ScriptDirectory.from_config(cfg).get_heads()) == 1
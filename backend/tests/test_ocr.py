@@ -0,0 +1,99 @@
+import pytest
+from PIL import Image
+
+from app.main import _otsu_threshold, binarize
+
+
+def test_otsu_splits_bimodal_histogram():
+    hist = [0] * 256
+    hist[40] = 300
+    hist[210] = 700
+    thr = _otsu_threshold(hist)
+    assert 40 <= thr < 210
+
+
+def test_binarize_is_bitonal():
+    img = Image.new("RGB", (20, 10), (230, 230, 230))
+    img.paste((30, 30, 30), (0, 0, 8, 10))
+    out = binarize(img)
+    assert out.mode == "L"
+    assert {c for _, c in out.getcolors()} == {0, 255}
+    assert out.getpixel((2, 2)) == 0 and out.getpixel((15, 5)) == 255
+
+
+def test_pdf_pages_render_grey(monkeypatch):
+    fitz = pytest.importorskip("fitz")
+    import app.main as m
+
+    doc = fitz.open()
+    doc.new_page(width=100, height=50).insert_text((10, 30), "Hi")
+    seen = []
+    monkeypatch.setattr(m, "image_to_text", lambda img: seen.append(img.mode) or "ok")
+    assert m._ocr_doc_pages(doc, [0], 1.0) == ["ok"]
+    assert seen == ["L"]
+
+
+def test_ocr_pool_shut_down_with_app():
+    from fastapi.testclient import TestClient
+    import app.main as m
+
+    with TestClient(m.app):
+        pool = m._ocr_pool()
+    assert m._ocr_pool.cache_info().currsize == 0
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+
+
+def test_pdf_without_pages_skips_ocr(monkeypatch):
+    import app.main as m
+
+    pytest.importorskip("fitz")
+    monkeypatch.setattr(m, "pdf_ocr_to_text", lambda *a: pytest.fail("OCR attempted"))
+    empty = b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+    assert m.pdf_to_text(empty) == ""
+
+
+def test_ocr_pool_never_forks_and_is_shut_down_when_dropped():
+    import app.main as m
+
+    pool = m._ocr_pool()
+    assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    m._drop_ocr_pool()
+    assert m._ocr_pool.cache_info().currsize == 0
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
+
+
+def test_dropping_a_stale_ocr_pool_keeps_the_current_one():
+    import app.main as m
+
+    old = m._ocr_pool()
+    m._drop_ocr_pool(old)
+    current = m._ocr_pool()
+    try:
+        assert current is not old
+        m._drop_ocr_pool(old)  # a second request that also saw `old` break
+        assert m._ocr_pool() is current
+        assert current.submit(int).result() == 0
+    finally:
+        m._drop_ocr_pool()
+
+
+def test_pdf_ocr_keeps_pool_when_a_page_fails(monkeypatch):
+    import app.main as m
+
+    fitz = pytest.importorskip("fitz")
+
+    class Pool:
+        def map(self, *a):
+            raise ValueError("bad page")
+
+    pool = Pool()
+    monkeypatch.setattr(m, "_ocr_pool", lambda: pool)
+    monkeypatch.setattr(m, "_ocr_workers", lambda: 2)
+    monkeypatch.setattr(m, "_drop_ocr_pool", lambda *a, **k: pytest.fail("pool dropped"))
+    monkeypatch.setattr(m, "_ocr_page_range", lambda data, pages, zoom: ["in-process"])
+    pdf = fitz.open()
+    pdf.new_page()
+    pdf.new_page()
+    assert m.pdf_ocr_to_text(pdf.tobytes()) == "in-process"
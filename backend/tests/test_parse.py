@@ -0,0 +1,172 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.main import (
+    DAYS_LIST_RE, _fast_date, _token_date, parse_days_list, parse_text_into_fields, scrub_title, to_24h,
+)
+
+
+@pytest.mark.parametrize("h,ampm,expected", [
+    (12, "am", 0), (12, "AM", 0), (1, "am", 1),
+    (12, "pm", 12), (1, "pm", 13), (11, "Pm", 23),
+    (14, None, 14), (9, "", 9),
+])
+def test_to_24h(h, ampm, expected):
+    assert to_24h(h, 30, ampm) == (expected, 30)
+
+
+def test_parse_emits_utc_z():
+    out = parse_text_into_fields("Standup 12/01/2025 9:30am-10am", "America/New_York")
+    assert out["start"] == "2025-12-01T14:30:00Z"
+    assert out["end"] == "2025-12-01T15:00:00Z"
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Gym Mon/Wed/Fri 7am", [1, 3, 5]),
+    ("class every tues, thurs 9am", [2, 4]),
+    ("standup weekdays 9:15am", [1, 2, 3, 4, 5]),
+    ("meds daily 8am", [0, 1, 2, 3, 4, 5, 6]),
+    ("lunch at noon", None),
+])
+def test_parse_days_list(text, expected):
+    assert parse_days_list(text) == expected
+
+
+
+@pytest.mark.parametrize("raw,expected", [
+    ("2025-12-03", date(2025, 12, 3)),
+    ("12/03/2025", date(2025, 12, 3)),
+    ("12/03/25", date(2025, 12, 3)),
+    ("12/03", None),
+    ("Dec 3, 2025", None),
+    ("13/45/2025", None),
+])
+def test_fast_date(raw, expected):
+    assert _fast_date(raw) == expected
+
+
+def test_explicit_numeric_date():
+    out = parse_text_into_fields("Team sync 12/03/2025 3pm-4pm at Room 5", "UTC")
+    assert out["start"] == "2025-12-03T15:00:00Z"
+    assert out["location"] == "Room 5"
+
+
+@pytest.mark.parametrize("text", [
+    "Gym Mon/Wed/Fri 7am", "class every tues, thurs 9am", "mon-fri standup",
+    "Sunday brunch then sat, sun / mon", "Monthly review", "sat down, mon",
+    "weekdays, mon", "Mon , Wed /Fri", "tuesday9 tue", "lunch at noon",
+])
+def test_parse_days_list_matches_regex(text):
+    m = DAYS_LIST_RE.search(text)
+    if not m:
+        assert parse_days_list(text) is None
+    else:
+        assert parse_days_list(text) == parse_days_list(m.group("days"))
+
+
+@pytest.mark.parametrize("text,title", [
+    ("CS lecture Mon/Wed 9:30-10:20 until Dec 10", "CS lecture"),
+    ("Team sync 12/03/2025 3pm-4pm at Room 5, notes: bring slides", "Team sync"),
+    ("Interview 11/3 at 2:30pm for 1.5h", "Interview"),
+    ("Gym daily 6am-7am for 6 weeks", "Gym"),
+    ("Party Dec 31, 2025 9pm-1am in NYC", "Party"),
+    ("3pm-4pm", "Untitled"),
+])
+def test_scrub_title(text, title):
+    assert scrub_title(text) == title
+
+
+@pytest.mark.parametrize("prompt,start", [
+    ("Dentist Dec 3, 2025 2pm-3pm", "2025-12-03T14:00:00Z"),
+    ("Offsite 12/05/25 9am-5pm", "2025-12-05T09:00:00Z"),
+    ("Conference Sept 12, 2026 - Sept 14, 2026 9am-5pm", "2026-09-12T09:00:00Z"),
+])
+def test_explicit_dates(prompt, start):
+    assert parse_text_into_fields(prompt, "UTC")["start"] == start
+
+
+def test_until_month_day():
+    out = parse_text_into_fields("Yoga Mon/Wed 7am-8am until 1/15/2027", "UTC")
+    assert out["repeatDays"] == [1, 3]
+    assert out["repeatUntil"] == "2027-01-15"
+
+
+def test_parse_cache_returns_fresh_copies():
+    a = parse_text_into_fields("Yoga Mon/Wed 7am-8am until 1/15/2027", "UTC")
+    a["repeatDays"].append(5)
+    a["title"] = "changed"
+    b = parse_text_into_fields("Yoga Mon/Wed 7am-8am until 1/15/2027", "UTC")
+    assert b["repeatDays"] == [1, 3]
+    assert b["title"] != "changed"
+
+
+def test_relative_date_with_time_range():
+    tomorrow = datetime.now(timezone.utc).date() + timedelta(days=1)
+    out = parse_text_into_fields("Standup tomorrow 3pm-4pm", "UTC")
+    assert out["title"] == "Standup"
+    assert out["start"] == f"{tomorrow.isoformat()}T15:00:00Z"
+
+
+@pytest.mark.parametrize("prompt,start,end", [
+    ("Standup 12/03/2025 3pm for 45 min", "2025-12-03T15:00:00Z", "2025-12-03T15:45:00Z"),
+    ("Class 11/01/2025-11/03/2025 9:30am-10am", "2025-11-01T09:30:00Z", "2025-11-01T10:00:00Z"),
+])
+def test_times_ignore_date_digits(prompt, start, end):
+    out = parse_text_into_fields(prompt, "UTC")
+    assert (out["start"], out["end"]) == (start, end)
+
+
+@pytest.mark.parametrize("prompt,title", [
+    ("Meeting—2pm-3pm 12/03/2025", "Meeting"),
+    ("Review-2pm-3pm 12/03/2025", "Review"),
+    ("Room 204-2pm-3pm 12/03/2025", "Room 204"),
+])
+def test_times_after_a_dash_are_kept(prompt, title):
+    out = parse_text_into_fields(prompt, "UTC")
+    assert out["title"] == title
+    assert (out["start"], out["end"]) == ("2025-12-03T14:00:00Z", "2025-12-03T15:00:00Z")
+
+
+@pytest.mark.parametrize("tok,expected", [
+    ("Nov 5", date(2026, 11, 5)),
+    ("december 12, 2027", date(2027, 12, 12)),
+    ("Sept 3,2027", date(2027, 9, 3)),  # dateutil reads "3,2027" as the year
+])
+def test_token_date_month_names(tok, expected):
+    now = datetime(2026, 10, 15, tzinfo=timezone.utc)
+    assert _token_date(tok, now) == expected
+
+
+def test_token_date_rejects_day_out_of_range():
+    with pytest.raises(ValueError):
+        _token_date("Feb 32", datetime(2026, 10, 15, tzinfo=timezone.utc))
+
+
+def test_long_prompts_bypass_parse_cache():
+    from app.main import PARSE_CACHE_MAX_CHARS, _parse_cached
+
+    before = _parse_cached.cache_info().currsize
+    prompt = "Standup 12/01/2025 9:30am-10am " + "x" * PARSE_CACHE_MAX_CHARS
+    assert parse_text_into_fields(prompt, "UTC")["start"] == "2025-12-01T09:30:00Z"
+    assert _parse_cached.cache_info().currsize == before
+
+
+def test_next_full_weekday_name():
+    out = parse_text_into_fields("Dentist next Friday 2-4pm", "UTC")
+    assert out["title"] == "Dentist"
+    assert date.fromisoformat(out["start"][:10]).weekday() == 4
+
+
+def test_plain_title_takes_defaults():
+    out = parse_text_into_fields("Coffee with Sam at the cafe", "UTC")
+    assert out["title"] == "Coffee with Sam"
+    assert out["location"] == "the cafe"
+    assert out["start"].endswith("T09:00:00Z") and out["end"].endswith("T10:00:00Z")
+    assert "repeatDays" not in out
+
+
+def test_dash_lookalikes_and_nbsp_normalized():
+    out = parse_text_into_fields("Standup 12/01/2025 9:30am‑10am", "UTC")
+    assert out["title"] == "Standup"
+    assert (out["start"], out["end"]) == ("2025-12-01T09:30:00Z", "2025-12-01T10:00:00Z")
@@ -0,0 +1,115 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as m
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(m, "UPLOAD_DIR", tmp_path)
+    return TestClient(m.app)
+
+
+def test_upload_pdf_text_layer(client, tmp_path):
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Dentist 12/03/2025 2pm-3pm at Main St and some padding text")
+    r = client.post("/uploads", files={"file": ("appt.pdf", doc.tobytes(), "application/pdf")})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["fields"]["start"].startswith("2025-12-03T14:00:00")
+    saved = tmp_path / body["fileUrl"].rsplit("/", 1)[1]
+    assert saved.read_bytes()[:5] == b"%PDF-"
+    assert not list(tmp_path.glob("*.part"))
+    assert not list(m._upload_partial_dir().iterdir())
+
+
+def test_partial_upload_is_not_under_the_served_dir(client, tmp_path, monkeypatch):
+    seen = []
+    real_replace = m.Path.replace
+
+    def replace(self, target):
+        seen.append(self)
+        return real_replace(self, target)
+
+    monkeypatch.setattr(m.Path, "replace", replace)
+    monkeypatch.setattr(m, "ocr_to_text", lambda src: "")
+    monkeypatch.setattr(m, "_extract_upload", lambda name, is_pdf: _text(""))
+    r = client.post("/uploads", files={"file": ("x.png", b"not really a png", "image/png")})
+    assert r.status_code == 200
+    assert seen and all(tmp_path not in p.parents for p in seen)
+
+
+def test_upload_removed_when_extraction_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(m, "UPLOAD_DIR", tmp_path)
+
+    async def extract(name, is_pdf):
+        raise RuntimeError("extractor crashed")
+
+    monkeypatch.setattr(m, "_extract_upload", extract)
+    r = TestClient(m.app, raise_server_exceptions=False).post(
+        "/uploads", files={"file": ("x.png", b"not really a png", "image/png")}
+    )
+    assert r.status_code == 500
+    assert not list(tmp_path.iterdir())
+
+
+async def _text(t):
+    return t
+
+
+def test_upload_rejects_empty_and_oversized(client, tmp_path, monkeypatch):
+    r = client.post("/uploads", files={"file": ("x.png", b"", "image/png")})
+    assert r.status_code == 400
+
+    monkeypatch.setattr(m, "UPLOAD_MAX_BYTES", 10)
+    r = client.post("/uploads", files={"file": ("x.png", b"0" * 11, "image/png")})
+    assert r.status_code == 413
+    assert not list(tmp_path.iterdir())
+
+
+def _pdf(text):
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    return doc.tobytes()
+
+
+def test_upload_batch_keeps_order(client, tmp_path):
+    files = [
+        ("files", ("a.pdf", _pdf("Dentist 12/03/2025 2pm-3pm, bring the insurance card"), "application/pdf")),
+        ("files", ("b.pdf", _pdf("Standup 12/04/2025 9:30am-10am, weekly team check-in"), "application/pdf")),
+    ]
+    r = client.post("/uploads/batch", files=files)
+    assert r.status_code == 200
+    starts = [item["fields"]["start"][:16] for item in r.json()]
+    assert starts == ["2025-12-03T14:00", "2025-12-04T09:30"]
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_upload_batch_fails_as_a_whole(client, tmp_path):
+    files = [
+        ("files", ("a.pdf", _pdf("Dentist 12/03/2025 2pm-3pm, bring the insurance card"), "application/pdf")),
+        ("files", ("empty.png", b"", "image/png")),
+    ]
+    r = client.post("/uploads/batch", files=files)
+    assert r.status_code == 400
+    assert not list(tmp_path.iterdir())
+
+
+def test_upload_batch_removes_files_when_extraction_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(m, "UPLOAD_DIR", tmp_path)
+
+    async def extract(name, is_pdf):
+        if is_pdf:
+            raise RuntimeError("extractor crashed")
+        return "Standup 9am"
+
+    monkeypatch.setattr(m, "_extract_upload", extract)
+    files = [
+        ("files", ("a.pdf", b"%PDF-1.4 not really", "application/pdf")),
+        ("files", ("b.png", b"not really a png", "image/png")),
+    ]
+    r = TestClient(m.app, raise_server_exceptions=False).post("/uploads/batch", files=files)
+    assert r.status_code == 500
+    assert not list(tmp_path.iterdir())
@@ -1,7 +1,7 @@
 import { useEffect, useState } from "react";
 import type { AxiosError } from "axios";
 import type { EventOut, EventIn } from "./api";
-import { createEvent, updateEvent, deleteEvent, suggestNext } from "./api";
+import { createEvent, createEventsBulk, updateEvent, deleteEvent, suggestNext } from "./api";
 import { isoToLocalInput, localInputToISO, nowLocalInput } from "./datetime";
 import { BASE_URL } from "./api";
 
@@ -117,22 +117,21 @@ export default function EventModal({ initial, onClose, onSaved }: Props) {
       if (!isEdit && anyRepeat) {
         const batch = enumerateRepeats();
         if (batch.length === 0) { alert("No matching days between start and until."); return; }
-        for (const ev of batch) {
-          try {
-            const saved = await createEvent(ev);
-            onSaved(saved, "create");
-          } catch (err: any) {
-            if ((err as AxiosError)?.response?.status === 409) {
-              const data: any = (err as AxiosError).response?.data;
-              setConflict(data?.detail?.conflicts?.[0] ?? null);
-              try { setSuggested(await suggestNext(ev.start, ev.end)); } catch {}
-              return;
-            } else {
-              console.error(err);
-              alert("Couldn’t save one of the repeats. See console.");
-              return;
-            }
+        try {
+          // one request, one INSERT; nothing is saved if any occurrence clashes
+          const saved = await createEventsBulk(batch);
+          saved.forEach((ev) => onSaved(ev, "create"));
+        } catch (err: any) {
+          if ((err as AxiosError)?.response?.status === 409) {
+            const data: any = (err as AxiosError).response?.data;
+            const clash = batch[data?.detail?.index ?? 0];
+            setConflict(clash ? { title: clash.title, start: clash.start, end: clash.end } : null);
+            if (clash) { try { setSuggested(await suggestNext(clash.start, clash.end)); } catch {} }
+          } else {
+            console.error(err);
+            alert("Couldn’t save the repeats. See console.");
           }
+          return;
         }
         onClose();
         return;
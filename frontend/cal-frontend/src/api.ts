@@ -38,6 +38,10 @@ export const listEvents = (start?: string, end?: string) =>
 export const createEvent = (e: EventIn) =>
   api.post<EventOut>("/events", e).then((r) => r.data);
 
+// All-or-nothing: a 409's detail.index points at the clashing item.
+export const createEventsBulk = (events: EventIn[]) =>
+  api.post<EventOut[]>("/events/bulk", events).then((r) => r.data);
+
 export const updateEvent = (id: number, e: EventIn) =>
   api.put<EventOut>(`/events/${id}`, e).then((r) => r.data);
 